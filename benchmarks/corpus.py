@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - benchmarks/corpus.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Build Java source corpora shaped like the decompiled Minecraft sources, for benchmarking
+#
+
+import os, re
+from pathlib import Path
+
+fixtures_dir = Path(os.path.dirname(__file__)) / "fixtures"
+
+# The version each fixture is written for, which decides the files and parsers used
+fixture_versions = {
+	'modern': "26.2",
+	'legacy': "1.19.2",
+}
+
+# Files that are read whole but never grow with the number of items
+unscaled_files = ["world/item/DyeColor.java"]
+
+item_reference_regex = re.compile(r"\b((?:Items|Blocks)\.|public static final [\w<>]+ )([A-Z][A-Z0-9_]*)\b")
+
+# Give every item in a copy of a source file its own name, so that copies declare distinct items
+def rename_items(text, copy):
+	return item_reference_regex.sub(lambda m: f"{m.group(1)}{m.group(2)}_K{copy}", text)
+
+def get_scaled_name(item, copy):
+	return item if copy == 0 else f"{item}_K{copy}"
+
+# Write a corpus made of the fixture followed by scale - 1 renamed copies of it, returning the path to net/minecraft
+def build_corpus(fixture, scale, outpath):
+	fixture_path = fixtures_dir / fixture / "net" / "minecraft"
+	source_path = Path(outpath) / fixture / str(scale) / "net" / "minecraft"
+
+	for root, dirs, files in os.walk(fixture_path):
+		for f in files:
+			relpath = (Path(root) / f).relative_to(fixture_path)
+			with open(fixture_path / relpath, 'r') as sf:
+				text = sf.read()
+
+			os.makedirs((source_path / relpath).parent, exist_ok=True)
+			with open(source_path / relpath, 'w') as cf:
+				cf.write(text)
+				if relpath.as_posix() not in unscaled_files:
+					for copy in range(1, scale):
+						cf.write(rename_items(text, copy))
+
+	return source_path
+
+# Scale a set of preset prices to match a corpus
+def scale_base_worth(base_worth, scale):
+	return {get_scaled_name(item, copy): value for copy in range(scale) for item, value in base_worth.items()}
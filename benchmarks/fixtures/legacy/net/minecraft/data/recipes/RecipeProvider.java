@@ -0,0 +1,34 @@
+package net.minecraft.data.recipes;
+
+public class RecipeProvider implements DataProvider {
+    private static final ImmutableList<ItemLike> IRON_SMELTABLES = ImmutableList.of((Object)Items.IRON_ORE, (Object)Items.DEEPSLATE_IRON_ORE, (Object)Items.RAW_IRON);
+
+    protected static void buildCraftingRecipes(Consumer<FinishedRecipe> consumer) {
+        RecipeProvider.planksFromLog(consumer, Blocks.OAK_PLANKS, ItemTags.OAK_LOGS);
+        ShapedRecipeBuilder.shaped(Items.STICK, 4).define(Character.valueOf('#'), ItemTags.PLANKS).pattern("#").pattern("#").group("sticks").unlockedBy("has_planks", RecipeProvider.has(ItemTags.PLANKS)).save(consumer);
+        ShapedRecipeBuilder.shaped(Blocks.CHEST).define(Character.valueOf('#'), ItemTags.PLANKS).pattern("###").pattern("# #").pattern("###").unlockedBy("has_lots_of_items", RecipeProvider.has(ItemTags.PLANKS)).save(consumer);
+        ShapedRecipeBuilder.shaped(Blocks.ANVIL).define(Character.valueOf('I'), Blocks.IRON_BLOCK).define(Character.valueOf('i'), Items.IRON_INGOT).pattern("III").pattern(" i ").pattern("iii").unlockedBy("has_iron_block", RecipeProvider.has(Blocks.IRON_BLOCK)).save(consumer);
+        ShapedRecipeBuilder.shaped(Blocks.STONECUTTER).define(Character.valueOf('I'), Items.IRON_INGOT).define(Character.valueOf('#'), Blocks.STONE).pattern(" I ").pattern("###").unlockedBy("has_stone", RecipeProvider.has(Blocks.STONE)).save(consumer);
+        ShapelessRecipeBuilder.shapeless(Blocks.WHITE_WOOL).requires(Items.STRING, 4).unlockedBy("has_string", RecipeProvider.has(Items.STRING)).save(consumer);
+        ShapelessRecipeBuilder.shapeless(Items.MELON_SLICE, 9).requires(Blocks.MELON).save(consumer);
+        RecipeProvider.oreSmelting(consumer, IRON_SMELTABLES, Items.IRON_INGOT, 0.7f, 200, "iron_ingot");
+        RecipeProvider.oreBlasting(consumer, IRON_SMELTABLES, Items.IRON_INGOT, 0.7f, 100, "iron_ingot");
+        SimpleCookingRecipeBuilder.smelting(Ingredient.of(Blocks.COBBLESTONE), Blocks.STONE, 0.1f, 200).unlockedBy("has_cobblestone", RecipeProvider.has(Blocks.COBBLESTONE)).save(consumer);
+        SimpleCookingRecipeBuilder.smelting(Ingredient.of(ItemTags.SMELTS_TO_GLASS), Blocks.GLASS, 0.1f, 200).save(consumer);
+        SingleItemRecipeBuilder.stonecutting(Ingredient.of(Blocks.STONE), Blocks.STONE_SLAB, 2).unlockedBy("has_stone", RecipeProvider.has(Blocks.STONE)).save(consumer, "stone_slab_from_stone_stonecutting");
+        SingleItemRecipeBuilder.stonecutting(Ingredient.of(Blocks.STONE), Blocks.STONE_BRICKS).unlockedBy("has_stone", RecipeProvider.has(Blocks.STONE)).save(consumer, "stone_bricks_from_stone_stonecutting");
+        RecipeProvider.netheriteSmithing(consumer, Items.DIAMOND_SWORD, RecipeCategory.COMBAT, Items.NETHERITE_SWORD);
+        RecipeProvider.nineBlockStorageRecipes(consumer, Items.IRON_INGOT, Items.IRON_BLOCK, "iron_ingot_from_iron_block", "iron_ingot");
+        RecipeProvider.nineBlockStorageRecipesWithCustomPacking(consumer, Items.IRON_NUGGET, Items.IRON_INGOT, "iron_ingot_from_nuggets", "iron_ingot");
+        RecipeProvider.nineBlockStorageRecipes(consumer, Items.COPPER_INGOT, Items.COPPER_BLOCK);
+        RecipeProvider.oneToOneConversionRecipe(consumer, Items.RED_DYE, Items.POPPY, "red_dye");
+        RecipeProvider.stairBuilder(Blocks.STONE_STAIRS, Ingredient.of(Blocks.STONE)).unlockedBy("has_stone", RecipeProvider.has(Blocks.STONE)).save(consumer);
+        SpecialRecipeBuilder.special(RecipeSerializer.SHULKER_BOX_COLORING).save(consumer, "shulker_box_coloring");
+        RecipeProvider.woodenBoat(consumer, Items.OAK_BOAT, Blocks.OAK_PLANKS);
+    }
+
+    public static void cookRecipes(Consumer<FinishedRecipe> consumer, String string, SimpleCookingSerializer<?> simpleCookingSerializer, int n) {
+        RecipeProvider.simpleCookingRecipe(consumer, string, simpleCookingSerializer, n, Items.BEEF, Items.COOKED_BEEF);
+        RecipeProvider.simpleCookingRecipe(consumer, string, simpleCookingSerializer, n, Items.KELP, Items.DRIED_KELP);
+    }
+}
@@ -0,0 +1,40 @@
+package net.minecraft.world.item;
+
+public abstract class CreativeModeTab {
+    public static final CreativeModeTab[] TABS = new CreativeModeTab[12];
+    public static final CreativeModeTab TAB_BUILDING_BLOCKS = (new CreativeModeTab(0, "buildingBlocks") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Blocks.BRICKS);
+        }
+    }).setRecipeFolderName("building_blocks");
+    public static final CreativeModeTab TAB_DECORATIONS = new CreativeModeTab(1, "decorations") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Blocks.PEONY);
+        }
+    };
+    public static final CreativeModeTab TAB_REDSTONE = new CreativeModeTab(2, "redstone") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Items.REDSTONE);
+        }
+    };
+    public static final CreativeModeTab TAB_MISC = new CreativeModeTab(7, "misc") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Items.LAVA_BUCKET);
+        }
+    };
+    public static final CreativeModeTab TAB_FOOD = new CreativeModeTab(9, "food") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Items.APPLE);
+        }
+    };
+    public static final CreativeModeTab TAB_TOOLS = new CreativeModeTab(10, "tools") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Items.IRON_AXE);
+        }
+    };
+    public static final CreativeModeTab TAB_COMBAT = new CreativeModeTab(11, "combat") {
+        public ItemStack makeIcon() {
+            return new ItemStack(Items.GOLDEN_SWORD);
+        }
+    };
+}
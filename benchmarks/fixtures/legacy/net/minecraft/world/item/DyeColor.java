@@ -0,0 +1,11 @@
+package net.minecraft.world.item;
+
+public enum DyeColor implements StringRepresentable
+{
+    WHITE(0, "white", 0xF9FFFE, MapColor.SNOW, 0xF0F0F0, 0xFFFFFF),
+    ORANGE(1, "orange", 16351261, MapColor.COLOR_ORANGE, 15435844, 16738335),
+    RED(14, "red", 11546150, MapColor.COLOR_RED, 11743532, 0xFF0000),
+    BLACK(15, "black", 0x1D1D21, MapColor.COLOR_BLACK, 0x1E1B1B, 0);
+
+    private static final IntFunction<DyeColor> BY_ID = ByIdMap.continuous(DyeColor::getId, DyeColor.values(), ByIdMap.OutOfBoundsStrategy.ZERO);
+}
@@ -0,0 +1,59 @@
+package net.minecraft.world.item;
+
+public class Items {
+    public static final Item AIR = Items.registerBlock(new AirItem(Blocks.AIR, new Item.Properties()));
+    public static final Item STONE = Items.registerBlock(Blocks.STONE, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item COBBLESTONE = Items.registerBlock(Blocks.COBBLESTONE, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item STONE_SLAB = Items.registerBlock(Blocks.STONE_SLAB, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item STONE_STAIRS = Items.registerBlock(Blocks.STONE_STAIRS, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item OAK_LOG = Items.registerBlock(Blocks.OAK_LOG, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item STRIPPED_OAK_LOG = Items.registerBlock(Blocks.STRIPPED_OAK_LOG, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item OAK_PLANKS = Items.registerBlock(Blocks.OAK_PLANKS, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item OAK_SLAB = Items.registerBlock(Blocks.OAK_SLAB, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item OAK_FENCE = Items.registerBlock(Blocks.OAK_FENCE, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item STICK = Items.registerItem("stick", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item CHEST = Items.registerBlock(Blocks.CHEST, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item IRON_INGOT = Items.registerItem("iron_ingot", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item IRON_NUGGET = Items.registerItem("iron_nugget", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item IRON_BLOCK = Items.registerBlock(Blocks.IRON_BLOCK, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item RAW_IRON = Items.registerItem("raw_iron", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item IRON_ORE = Items.registerBlock(Blocks.IRON_ORE, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item DEEPSLATE_IRON_ORE = Items.registerBlock(Blocks.DEEPSLATE_IRON_ORE, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item ANVIL = Items.registerBlock(Blocks.ANVIL, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item CHIPPED_ANVIL = Items.registerBlock(Blocks.CHIPPED_ANVIL, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item DAMAGED_ANVIL = Items.registerBlock(Blocks.DAMAGED_ANVIL, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item COPPER_INGOT = Items.registerItem("copper_ingot", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item COPPER_BLOCK = Items.registerBlock(Blocks.COPPER_BLOCK, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item CUT_COPPER = Items.registerBlock(Blocks.CUT_COPPER, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item EXPOSED_COPPER = Items.registerBlock(Blocks.EXPOSED_COPPER, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item WAXED_COPPER_BLOCK = Items.registerBlock(Blocks.WAXED_COPPER_BLOCK, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item HONEYCOMB = Items.registerItem("honeycomb", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item WHITE_WOOL = Items.registerBlock(Blocks.WHITE_WOOL, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item STRING = Items.registerItem("string", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item SAND = Items.registerBlock(Blocks.SAND, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item RED_SAND = Items.registerBlock(Blocks.RED_SAND, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item GLASS = Items.registerBlock(Blocks.GLASS, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item BEEF = Items.registerItem("beef", new Item(new Item.Properties().tab(CreativeModeTab.TAB_FOOD)));
+    public static final Item COOKED_BEEF = Items.registerItem("cooked_beef", new Item(new Item.Properties().tab(CreativeModeTab.TAB_FOOD)));
+    public static final Item DIAMOND = Items.registerItem("diamond", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item NETHERITE_INGOT = Items.registerItem("netherite_ingot", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item DIAMOND_SWORD = Items.registerItem("diamond_sword", new Item(new Item.Properties().tab(CreativeModeTab.TAB_COMBAT)));
+    public static final Item NETHERITE_SWORD = Items.registerItem("netherite_sword", new Item(new Item.Properties().tab(CreativeModeTab.TAB_COMBAT)));
+    public static final Item WRITABLE_BOOK = Items.registerItem("writable_book", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item MAP = Items.registerItem("map", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item CUT_STANDSTONE_SLAB = Items.registerBlock(Blocks.CUT_STANDSTONE_SLAB, CreativeModeTab.TAB_MISC);
+    public static final Item STONECUTTER = Items.registerBlock(Blocks.STONECUTTER, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item STONE_BRICKS = Items.registerBlock(Blocks.STONE_BRICKS, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item SHULKER_BOX = Items.registerBlock(Blocks.SHULKER_BOX, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item WHITE_DYE = Items.registerItem("white_dye", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item RED_DYE = Items.registerItem("red_dye", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item ORANGE_DYE = Items.registerItem("orange_dye", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item BLACK_DYE = Items.registerItem("black_dye", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item MELON = Items.registerBlock(Blocks.MELON, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item MELON_SLICE = Items.registerItem("melon_slice", new Item(new Item.Properties().tab(CreativeModeTab.TAB_FOOD)));
+    public static final Item DIRT = Items.registerBlock(Blocks.DIRT, CreativeModeTab.TAB_BUILDING_BLOCKS);
+    public static final Item DIRT_PATH = Items.registerBlock(Blocks.DIRT_PATH, CreativeModeTab.TAB_DECORATIONS);
+    public static final Item LOOP_A = Items.registerItem("loop_a", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item LOOP_B = Items.registerItem("loop_b", new Item(new Item.Properties().tab(CreativeModeTab.TAB_MISC)));
+    public static final Item COMMAND_BLOCK = Items.registerBlock(new GameMasterBlockItem(Blocks.COMMAND_BLOCK, new Item.Properties().rarity(Rarity.EPIC)));
+}
@@ -0,0 +1,6 @@
+package net.minecraft.data;
+
+public class BlockFamilies {
+    public static final BlockFamily OAK_PLANKS = BlockFamilies.familyBuilder(Blocks.OAK_PLANKS).button(Blocks.OAK_BUTTON).fence(Blocks.OAK_FENCE).fenceGate(Blocks.OAK_FENCE_GATE).slab(Blocks.OAK_SLAB).stairs(Blocks.OAK_STAIRS).sign(Blocks.OAK_SIGN, Blocks.OAK_WALL_SIGN).recipeGroupPrefix("wooden").recipeUnlockedBy("has_planks").getFamily();
+    public static final BlockFamily STONE = BlockFamilies.familyBuilder(Blocks.STONE).slab(Blocks.STONE_SLAB).stairs(Blocks.STONE_STAIRS).cobbled(Blocks.COBBLESTONE).getFamily();
+}
@@ -0,0 +1,11 @@
+package net.minecraft.data.recipes;
+
+public abstract class RecipeProvider {
+    protected void generateForEnabledBlockFamilies(FeatureFlagSet featureFlagSet) {
+    }
+
+    public void cookRecipes(String string, RecipeSerializer<T> recipeSerializer, AbstractCookingRecipe.Factory<T> factory, int n) {
+        this.simpleCookingRecipe(string, recipeSerializer, n, Items.BEEF, Items.COOKED_BEEF);
+        this.simpleCookingRecipe(string, recipeSerializer, n, Items.KELP, Items.DRIED_KELP);
+    }
+}
@@ -0,0 +1,42 @@
+package net.minecraft.data.recipes.packs;
+
+public class VanillaRecipeProvider extends RecipeProvider {
+    private static final ImmutableList<ItemLike> IRON_SMELTABLES = ImmutableList.of((Object)Items.IRON_ORE, (Object)Items.DEEPSLATE_IRON_ORE, (Object)Items.RAW_IRON);
+
+    public void buildRecipes() {
+        this.planksFromLog(Blocks.OAK_PLANKS, ItemTags.OAK_LOGS, 4);
+        this.shaped(RecipeCategory.MISC, Items.STICK, 4).define(Character.valueOf('#'), ItemTags.PLANKS).pattern("#").pattern("#").group("sticks").unlockedBy("has_planks", this.has(ItemTags.PLANKS)).save(this.output);
+        this.shaped(RecipeCategory.DECORATIONS, Blocks.CHEST).define(Character.valueOf('#'), ItemTags.PLANKS).pattern("###").pattern("# #").pattern("###").unlockedBy("has_lots_of_items", this.has(ItemTags.PLANKS)).save(this.output);
+        this.shaped(RecipeCategory.DECORATIONS, Blocks.ANVIL).define(Character.valueOf('I'), Blocks.IRON_BLOCK).define(Character.valueOf('i'), Items.IRON_INGOT).pattern("III").pattern(" i ").pattern("iii").unlockedBy("has_iron_block", this.has(Blocks.IRON_BLOCK)).save(this.output);
+        this.shaped(RecipeCategory.DECORATIONS, Blocks.STONECUTTER).define(Character.valueOf('I'), Items.IRON_INGOT).define(Character.valueOf('#'), Blocks.STONE).pattern(" I ").pattern("###").unlockedBy("has_stone", this.has(Blocks.STONE)).save(this.output);
+        this.shapeless(RecipeCategory.BUILDING_BLOCKS, Blocks.WHITE_WOOL).requires(Items.STRING, 4).unlockedBy("has_string", this.has(Items.STRING)).save(this.output);
+        this.shapeless(RecipeCategory.FOOD, Items.DRIED_KELP, 9).requires(Blocks.DRIED_KELP_BLOCK).save(this.output);
+        this.shapeless(RecipeCategory.MISC, Items.LOOP_A).requires(Items.LOOP_B).save(this.output);
+        this.shapeless(RecipeCategory.MISC, Items.LOOP_B).requires(Items.LOOP_A).save(this.output);
+        this.shapeless(RecipeCategory.MISC, Items.MELON_SLICE, 9).requires(Ingredient.of((ItemLike)Items.MELON, (ItemLike)Items.GLASS)).save(this.output);
+        this.oreSmelting(IRON_SMELTABLES, RecipeCategory.MISC, CookingBookCategory.MISC, Items.IRON_INGOT, 0.7f, 200, "iron_ingot");
+        this.oreBlasting(IRON_SMELTABLES, RecipeCategory.MISC, CookingBookCategory.MISC, Items.IRON_INGOT, 0.7f, 100, "iron_ingot");
+        SimpleCookingRecipeBuilder.smelting(Ingredient.of(Blocks.COBBLESTONE), RecipeCategory.BUILDING_BLOCKS, CookingBookCategory.BLOCKS, Blocks.STONE, 0.1f, 200).unlockedBy("has_cobblestone", this.has(Blocks.COBBLESTONE)).save(this.output);
+        SimpleCookingRecipeBuilder.smelting(this.tag(ItemTags.SMELTS_TO_GLASS), RecipeCategory.BUILDING_BLOCKS, CookingBookCategory.BLOCKS, Blocks.GLASS, 0.1f, 200).save(this.output);
+        SimpleCookingRecipeBuilder.blasting(Ingredient.of(Blocks.COBBLESTONE), RecipeCategory.BUILDING_BLOCKS, CookingBookCategory.BLOCKS, Blocks.STONE, 0.1f, 100).save(this.output);
+        SingleItemRecipeBuilder.stonecutting(Ingredient.of(Blocks.STONE), RecipeCategory.BUILDING_BLOCKS, Blocks.STONE_SLAB, 2).unlockedBy("has_stone", this.has(Blocks.STONE)).save(this.output);
+        SingleItemRecipeBuilder.stonecutting(Ingredient.of(Blocks.STONE), RecipeCategory.BUILDING_BLOCKS, Blocks.STONE_BRICKS).unlockedBy("has_stone", this.has(Blocks.STONE)).save(this.output);
+        this.netheriteSmithing(Items.DIAMOND_SWORD, RecipeCategory.COMBAT, Items.NETHERITE_SWORD);
+        this.colorItemWithDye(dyes, Items.WOOL.asList(), "wool", RecipeCategory.BUILDING_BLOCKS);
+        TransmuteRecipeBuilder.transmute(RecipeCategory.DECORATIONS, ingredient, Ingredient.of((ItemLike)dyeItem), shulkerBoxBlock.asItem()).group("shulker_box_dye").save(this.output);
+        this.nineBlockStorageRecipes(RecipeCategory.MISC, Items.IRON_INGOT, RecipeCategory.BUILDING_BLOCKS, Items.IRON_BLOCK, "iron_ingot_from_iron_block", "iron_ingot");
+        this.nineBlockStorageRecipesWithCustomPacking(RecipeCategory.MISC, Items.IRON_NUGGET, RecipeCategory.MISC, Items.IRON_INGOT, "iron_ingot_from_nuggets", "iron_ingot");
+        this.nineBlockStorageRecipes(RecipeCategory.MISC, Items.COPPER_INGOT, RecipeCategory.BUILDING_BLOCKS, Items.COPPER_BLOCK);
+        this.twoByTwoPacker(RecipeCategory.BUILDING_BLOCKS, Blocks.STONE_BRICKS, Blocks.STONE);
+        this.oneToOneConversionRecipe(Items.RED_DYE, Items.POPPY, "red_dye");
+        this.twoByTwoPacker(RecipeCategory.BUILDING_BLOCKS, Blocks.CUT_COPPER, Blocks.COPPER_BLOCK, 4);
+        this.dryGhast(Blocks.DRIED_GHAST);
+        this.copySmithingTemplate(Items.NETHERITE_UPGRADE_SMITHING_TEMPLATE, Blocks.NETHERRACK);
+        DyeColor.VALUES.forEach(dyeColor -> SimpleCookingRecipeBuilder.smelting(Ingredient.of(Items.TERRACOTTA.pick((DyeColor)dyeColor)), RecipeCategory.DECORATIONS, Items.GLAZED_TERRACOTTA.pick((DyeColor)dyeColor), 0.1f, 200).save(this.output));
+        ColorCollection.zipApply(Items.DYE, Items.WOOL, (x$0, x$1) -> vanillaRecipeProvider.coloredWoolFromWhiteWoolAndDye((ItemLike)x$0, (ItemLike)x$1));
+        this.stairBuilder(Blocks.STONE_STAIRS, Ingredient.of(Blocks.STONE)).unlockedBy("has_stone", this.has(Blocks.STONE)).save(this.output);
+        this.special(RecipeSerializer.SHULKER_BOX_COLORING);
+        this.woodenBoat(Items.OAK_BOAT, Blocks.OAK_PLANKS);
+        String unrelatedLine = "nothing here";
+    }
+}
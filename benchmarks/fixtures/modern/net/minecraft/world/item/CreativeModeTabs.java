@@ -0,0 +1,37 @@
+package net.minecraft.world.item;
+
+public class CreativeModeTabs {
+    public static CreativeModeTab bootstrap(Registry<CreativeModeTab> registry) {
+        Registry.register(registry, BUILDING_BLOCKS, CreativeModeTab.builder(CreativeModeTab.Row.TOP, 0).title(Component.translatable("itemGroup.buildingBlocks")).icon(() -> new ItemStack(Blocks.BRICKS)).displayItems((itemDisplayParameters, output) -> {
+            output.accept(Items.STONE);
+            output.accept(Items.COBBLESTONE);
+            output.accept(Items.STONE_SLAB);
+            output.accept(Items.STONE_STAIRS);
+            output.accept(Items.OAK_LOG);
+            output.accept(Items.OAK_PLANKS);
+            output.accept(Items.CUT_STANDSTONE_SLAB);
+            output.accept(Items.COPPER_BLOCK);
+        }).build());
+        Registry.register(registry, FOOD_AND_DRINKS, CreativeModeTab.builder(CreativeModeTab.Row.TOP, 1).title(Component.translatable("itemGroup.foodAndDrink")).icon(() -> new ItemStack(Items.GOLDEN_APPLE)).displayItems((itemDisplayParameters, output) -> {
+            output.accept(Items.BEEF);
+            output.accept(Items.COOKED_BEEF);
+            CreativeModeTabs.generateSuspiciousStews(output, TabVisibility.PARENT_AND_SEARCH_TABS);
+            CreativeModeTabs.generatePotionEffectTypes(output, registryLookup, Items.POTION, TabVisibility.PARENT_AND_SEARCH_TABS, featureFlags);
+        }).build());
+        Registry.register(registry, TOOLS_AND_UTILITIES, CreativeModeTab.builder(CreativeModeTab.Row.TOP, 2).title(Component.translatable("itemGroup.tools")).icon(() -> new ItemStack(Items.DIAMOND_PICKAXE)).displayItems((itemDisplayParameters, output) -> {
+            output.accept(Items.DIAMOND_SWORD);
+            output.accept(Items.NETHERITE_SWORD);
+            CreativeModeTabs.generateFireworksAllDurations(output, TabVisibility.PARENT_AND_SEARCH_TABS);
+            CreativeModeTabs.generateInstrumentTypes(output, registryLookup, Items.GOAT_HORN, InstrumentTags.GOAT_HORNS, TabVisibility.PARENT_AND_SEARCH_TABS);
+            output.accept(Items.COMMAND_BLOCK);
+        }).build());
+        Registry.register(registry, OP_BLOCKS, CreativeModeTab.builder(CreativeModeTab.Row.BOTTOM, 6).title(Component.translatable("itemGroup.op")).icon(() -> new ItemStack(Items.COMMAND_BLOCK)).alignedRight().displayItems((itemDisplayParameters, output) -> {
+            output.accept(Items.COMMAND_BLOCK);
+        }).build());
+        return Registry.register(registry, INGREDIENTS, CreativeModeTab.builder(CreativeModeTab.Row.BOTTOM, 4).title(Component.translatable("itemGroup.ingredients")).icon(() -> new ItemStack(Items.IRON_INGOT)).displayItems((itemDisplayParameters, output) -> {
+            output.accept(Items.IRON_INGOT);
+            output.accept(Items.DIAMOND);
+            CreativeModeTabs.generateEnchantmentBookTypesOnlyMaxLevel(output, registryLookup, TabVisibility.PARENT_TAB_ONLY);
+        }).build());
+    }
+}
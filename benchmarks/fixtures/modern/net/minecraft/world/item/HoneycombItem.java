@@ -0,0 +1,6 @@
+package net.minecraft.world.item;
+
+public class HoneycombItem extends Item {
+    public static final Supplier<BiMap<Block, Block>> WAXABLES = Suppliers.memoize(() -> ImmutableBiMap.builder().put((Object)Blocks.COPPER_BLOCK, (Object)Blocks.WAXED_COPPER_BLOCK).put((Object)Blocks.CUT_COPPER, (Object)Blocks.WAXED_CUT_COPPER).build());
+    public static final Supplier<BiMap<Block, Block>> WAX_OFF_BY_BLOCK = Suppliers.memoize(() -> WAXABLES.get().inverse());
+}
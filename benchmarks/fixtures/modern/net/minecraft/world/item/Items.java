@@ -0,0 +1,61 @@
+package net.minecraft.world.item;
+
+public class Items {
+    public static final Item AIR = Items.registerBlock(Blocks.AIR);
+    public static final Item STONE = Items.registerBlock(Blocks.STONE);
+    public static final Item COBBLESTONE = Items.registerBlock(Blocks.COBBLESTONE);
+    public static final Item STONE_SLAB = Items.registerBlock(Blocks.STONE_SLAB);
+    public static final Item STONE_STAIRS = Items.registerBlock(Blocks.STONE_STAIRS);
+    public static final Item OAK_LOG = Items.registerBlock(Blocks.OAK_LOG);
+    public static final Item STRIPPED_OAK_LOG = Items.registerBlock(Blocks.STRIPPED_OAK_LOG);
+    public static final Item OAK_PLANKS = Items.registerBlock(Blocks.OAK_PLANKS);
+    public static final Item OAK_SLAB = Items.registerBlock(Blocks.OAK_SLAB);
+    public static final Item OAK_FENCE = Items.registerBlock(Blocks.OAK_FENCE);
+    public static final Item STICK = Items.registerItem("stick");
+    public static final Item CHEST = Items.registerBlock(Blocks.CHEST);
+    public static final Item IRON_INGOT = Items.registerItem("iron_ingot");
+    public static final Item IRON_NUGGET = Items.registerItem("iron_nugget");
+    public static final Item IRON_BLOCK = Items.registerBlock(Blocks.IRON_BLOCK);
+    public static final Item RAW_IRON = Items.registerItem("raw_iron");
+    public static final Item IRON_ORE = Items.registerBlock(Blocks.IRON_ORE);
+    public static final Item DEEPSLATE_IRON_ORE = Items.registerBlock(Blocks.DEEPSLATE_IRON_ORE);
+    public static final Item ANVIL = Items.registerBlock(Blocks.ANVIL);
+    public static final Item CHIPPED_ANVIL = Items.registerBlock(Blocks.CHIPPED_ANVIL);
+    public static final Item DAMAGED_ANVIL = Items.registerBlock(Blocks.DAMAGED_ANVIL);
+    public static final Item COPPER_INGOT = Items.registerItem("copper_ingot");
+    public static final Item COPPER_BLOCK = Items.registerBlock(Blocks.COPPER_BLOCK);
+    public static final Item CUT_COPPER = Items.registerBlock(Blocks.CUT_COPPER);
+    public static final Item EXPOSED_COPPER = Items.registerBlock(Blocks.EXPOSED_COPPER);
+    public static final Item WAXED_COPPER_BLOCK = Items.registerBlock(Blocks.WAXED_COPPER_BLOCK);
+    public static final WeatheringCopperItems COPPER_CHEST = WeatheringCopperItems.create(Blocks.COPPER_CHEST, Items::registerBlock);
+    public static final Item HONEYCOMB = Items.registerItem("honeycomb");
+    public static final Item WHITE_WOOL = Items.registerBlock(Blocks.WHITE_WOOL);
+    public static final ColorCollection<Item> WOOL = ColorCollection.of(Blocks.WOOL, Items::registerBlock);
+    public static final Item STRING = Items.registerItem("string");
+    public static final Item SAND = Items.registerBlock(Blocks.SAND);
+    public static final Item RED_SAND = Items.registerBlock(Blocks.RED_SAND);
+    public static final Item GLASS = Items.registerBlock(Blocks.GLASS);
+    public static final Item BEEF = Items.registerItem("beef");
+    public static final Item COOKED_BEEF = Items.registerItem("cooked_beef");
+    public static final Item DIAMOND = Items.registerItem("diamond");
+    public static final Item NETHERITE_INGOT = Items.registerItem("netherite_ingot");
+    public static final Item DIAMOND_SWORD = Items.registerItem("diamond_sword");
+    public static final Item NETHERITE_SWORD = Items.registerItem("netherite_sword");
+    public static final Item WRITABLE_BOOK = Items.registerItem("writable_book");
+    public static final Item MAP = Items.registerItem("map");
+    public static final Item CUT_STANDSTONE_SLAB = Items.registerBlock(Blocks.CUT_STANDSTONE_SLAB);
+    public static final Item STONECUTTER = Items.registerBlock(Blocks.STONECUTTER);
+    public static final Item STONE_BRICKS = Items.registerBlock(Blocks.STONE_BRICKS);
+    public static final Item SHULKER_BOX = Items.registerBlock(Blocks.SHULKER_BOX);
+    public static final Item WHITE_DYE = Items.registerItem("white_dye");
+    public static final Item RED_DYE = Items.registerItem("red_dye");
+    public static final Item ORANGE_DYE = Items.registerItem("orange_dye");
+    public static final Item BLACK_DYE = Items.registerItem("black_dye");
+    public static final Item MELON = Items.registerBlock(Blocks.MELON);
+    public static final Item MELON_SLICE = Items.registerItem("melon_slice");
+    public static final Item DIRT = Items.registerBlock(Blocks.DIRT);
+    public static final Item DIRT_PATH = Items.registerBlock(Blocks.DIRT_PATH);
+    public static final Item LOOP_A = Items.registerItem("loop_a");
+    public static final Item LOOP_B = Items.registerItem("loop_b");
+    public static final Item COMMAND_BLOCK = Items.registerBlock(Blocks.COMMAND_BLOCK);
+}
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - benchmarks/run.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Time the extraction and pricing pipeline on fixture and synthetic source corpora, and compare the
+# results (and optionally the timings and peak memory) against a stored baseline
+#
+
+import argparse, gc, hashlib, io, json, os, platform, statistics, sys, tempfile, time, tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import build_corpus, fixture_versions, scale_base_worth
+from lib import source_cache, Version
+from lib.get_recipes import get_recipes
+from lib.get_items import get_items, get_items_legacy
+from lib.item_registry import registry
+from lib.recipe import to_json
+from generate_worth import base_worth, calculate_worth, remap_names_for_essentials
+from generate_shops import build_shops, dump_shop
+
+benchmarks_dir = Path(os.path.dirname(__file__))
+default_baseline = benchmarks_dir / "baseline.json"
+
+# Slowdowns smaller than this are timer noise, however large they are relatively
+min_slowdown = 0.002
+
+# A fixed workload timed alongside every benchmark. Timings are compared as ratios to it, so a baseline saved on one
+# machine can be checked on another, and a machine slowing down partway through a run doesn't skew the comparison
+def reference_workload():
+	totals = {}
+	for i in range(20000):
+		key = f"ITEM_{i % 5000}"
+		totals[key] = totals.get(key, 0) + len(key.lower().replace('_', ''))
+	return sorted(totals.items())
+
+# Hash a result, so that a change in what the pipeline produces shows up next to the timings
+def digest(result):
+	return hashlib.sha256(json.dumps(result, default=to_json).encode()).hexdigest()
+
+# The benchmarks to run on a corpus, as (name, function) pairs; each function returns its result
+def get_cases(source_path, mc_version, scale):
+	legacy = mc_version < Version("1.19.3")
+	parse_items = get_items_legacy if legacy else get_items
+
+	# Inputs for the later stages are prepared once, outside of the timings
+	items = parse_items(source_path, mc_version, no_cache=True)
+	worth = scale_base_worth(base_worth, scale)
+	calculate_worth(worth, items['items'])
+	shop_worth = remap_names_for_essentials(worth)
+
+	def run_calculate_worth():
+		prices = scale_base_worth(base_worth, scale)
+		report = calculate_worth(prices, items['items'])
+		return {'worth': prices, 'cycles': report['cycles'], 'missing': report['missing']}
+
+	def run_shop_dumps():
+		# Silence the warnings about items missing from the worth data
+		with redirect_stdout(io.StringIO()):
+			return {filename: dump_shop(data) for filename, data in build_shops(items, shop_worth).items()}
+
+	return [
+		('get_recipes', lambda: get_recipes(source_path, mc_version, no_cache=True)),
+		('get_recipes (all recipes)', lambda: get_recipes(source_path, mc_version, simplest_only=False, no_cache=True)),
+		(parse_items.__name__, lambda: parse_items(source_path, mc_version, no_cache=True)),
+		(parse_items.__name__ + " (cached)", lambda: parse_items(source_path, mc_version)),
+		('calculate_worth', run_calculate_worth),
+		('shop yaml dumps', run_shop_dumps),
+	]
+
+def time_once(run):
+	# Garbage collection is paused while timing, as timeit does, to keep timings steady
+	gc.collect()
+	gc.disable()
+	try:
+		start = time.perf_counter()
+		result = run()
+		return time.perf_counter() - start, result
+	finally:
+		gc.enable()
+
+def measure(run, repeat):
+	timings = []
+	reference_timings = []
+	for _ in range(repeat):
+		reference_timings.append(time_once(reference_workload)[0])
+		elapsed, result = time_once(run)
+		timings.append(elapsed)
+
+	# Peak memory is measured on a separate run, as tracing allocations slows everything down
+	tracemalloc.start()
+	run()
+	peak = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+
+	return {
+		'time': min(timings),
+		'median': statistics.median(timings),
+		# Each timing is paired with the reference timed just before it, so both ran under the same load
+		'relative_time': statistics.median(t / r for t, r in zip(timings, reference_timings)),
+		'peak_memory': peak,
+		'digest': digest(result)
+	}
+
+def run_benchmarks(corpora, repeat, workdir):
+	# Parse caches are kept out of output/, so benchmarks never touch real cached data
+	source_cache.cache_dir = Path(workdir) / "itemcache"
+
+	results = {}
+	for fixture, scale in corpora:
+		# Synthetic corpora share no item names, so each starts with an empty registry as a run of its own would
+		registry.clear()
+		mc_version = Version(fixture_versions[fixture])
+		source_path = build_corpus(fixture, scale, workdir)
+		for name, run in get_cases(source_path, mc_version, scale):
+			key = f"{name} [{fixture} x{scale}]"
+			results[key] = measure(run, repeat)
+			print(f"{key}: {results[key]['time'] * 1000:.2f} ms, {results[key]['peak_memory'] / 1024:.0f} KiB peak")
+
+	return results
+
+# Compare results against a baseline, returning a list of regressions. Results that differ always count; timings
+# and memory only count with performance, with timings compared relative to the reference workload
+def compare(results, baseline, tolerance, performance=False):
+	regressions = []
+
+	print()
+	print(f"{'Benchmark':<50} {'Time':>10} {'Baseline':>10} {'Change':>8}  Memory change")
+	for key, result in results.items():
+		if key not in baseline:
+			print(f"{key:<50} {result['time'] * 1000:>8.2f}ms {'-':>10}")
+			continue
+
+		base = baseline[key]
+		# What the baseline's time comes to on this machine, going by the reference workload timed alongside it
+		expected_time = base['relative_time'] * result['time'] / result['relative_time']
+		time_change = result['time'] / expected_time - 1
+		memory_change = result['peak_memory'] / base['peak_memory'] - 1 if base['peak_memory'] else 0.0
+		print(f"{key:<50} {result['time'] * 1000:>8.2f}ms {expected_time * 1000:>8.2f}ms {time_change:>+8.0%}  {memory_change:+.0%}")
+
+		if result['digest'] != base['digest']:
+			regressions.append(f"{key}: result differs from the baseline")
+		if performance and time_change > tolerance and result['time'] - expected_time > min_slowdown:
+			regressions.append(f"{key}: {time_change:.0%} slower than the baseline")
+		if performance and memory_change > tolerance:
+			regressions.append(f"{key}: {memory_change:.0%} more peak memory than the baseline")
+
+	return regressions
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(prog="benchmarks/run.py", description="Benchmark the extraction and pricing pipeline and compare against a baseline")
+	parser.add_argument('-s', '--scale', type=int, default=100, help="How many renamed copies of each fixture make up the synthetic corpora (default: 100)")
+	parser.add_argument('-r', '--repeat', type=int, default=7, help="How many times to time each benchmark; the fastest run is kept (default: 7)")
+	parser.add_argument('-p', '--performance', action='store_true', help="Also count timings and peak memory that got worse as regressions, not just results that changed")
+	parser.add_argument('-t', '--tolerance', type=float, default=0.25, help="With --performance, how much slower or more memory-hungry a benchmark may get, relative to the reference workload, before it counts as a regression (default: 0.25)")
+	parser.add_argument('-b', '--baseline', type=Path, default=default_baseline, help="The baseline file to compare against")
+	parser.add_argument('--save_baseline', action='store_true', help="Save the results as the new baseline instead of comparing against it")
+	args = parser.parse_args()
+
+	corpora = [(fixture, scale) for fixture in fixture_versions for scale in [1, args.scale]]
+
+	with tempfile.TemporaryDirectory() as workdir:
+		results = run_benchmarks(corpora, args.repeat, workdir)
+
+	if args.save_baseline:
+		with open(args.baseline, 'w') as f:
+			json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results}, f, indent=2)
+		print(f"\nSaved baseline to {args.baseline}")
+		sys.exit(0)
+
+	if not args.baseline.exists():
+		print(f"\nNo baseline found at {args.baseline}, run with --save_baseline to create one")
+		sys.exit(0)
+
+	with open(args.baseline, 'r') as f:
+		baseline = json.load(f)
+
+	# Memory use and speed depend on the Python version, even relative to the reference workload
+	if args.performance and baseline['python'].rsplit('.', 1)[0] != platform.python_version().rsplit('.', 1)[0]:
+		print(f"\nWarning: the baseline was saved with Python {baseline['python']}, so timings and memory may not be comparable")
+
+	regressions = compare(results, baseline['results'], args.tolerance, args.performance)
+	if regressions:
+		print("\nRegressions:")
+		for regression in regressions:
+			print(f" - {regression}")
+		sys.exit(1)
+
+	print("\nNo regressions found")
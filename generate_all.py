@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - generate_all.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Generate the items list, worth.yml and shops for many Minecraft versions at once
+#
+
+import argparse, os, sys, traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+
+from lib import Version
+from lib.prepare_source import prepare_sources
+from lib.instrument import instrument_run, stage
+from lib.pipeline import release_context
+from lib.version_manifest import expand_versions
+from generate_items import generate_items
+from generate_worth import generate_worth
+from generate_shops import generate_shops
+
+script_dir = Path(os.path.dirname(__file__))
+output_dir = script_dir / "output"
+
+# Run every stage for one version, logging its output to output/<version>/generate.log
+def generate_version(mc_version, no_cache=False):
+	mc_version = Version(mc_version)
+	version_dir = output_dir / str(mc_version)
+	os.makedirs(version_dir, exist_ok=True)
+
+	timings = {}
+	with open(version_dir / "generate.log", 'w') as log, redirect_stdout(log), redirect_stderr(log):
+		try:
+			with instrument_run(str(mc_version), report_path=version_dir / "report.json"):
+				for name, run in [
+					('items', lambda: generate_items(mc_version, no_cache, outpath=version_dir / "items.json")),
+					('worth', lambda: generate_worth(mc_version, no_cache, outpath=version_dir / "worth.yml")),
+					('shops', lambda: generate_shops(mc_version, no_cache, outpath=version_dir / "BossShopPro", worth_path=version_dir / "worth.yml")),
+				]:
+					with stage(name) as node:
+						run()
+					timings[name] = node['time']
+		except Exception:
+			traceback.print_exc()
+			raise
+		finally:
+			# Workers go on to other versions, so don't keep this one's items around
+			release_context(mc_version)
+
+	return timings
+
+def print_summary(results):
+	stages = ['source', 'items', 'worth', 'shops']
+	rows = [['Version', 'Status'] + [s.title() for s in stages] + ['Total']]
+
+	for mc_version, (status, detail) in results.items():
+		if status == 'ok':
+			rows.append([mc_version, status] + [f"{detail[s]:.1f}s" for s in stages] + [f"{sum(detail.values()):.1f}s"])
+		else:
+			rows.append([mc_version, status] + [''] * len(stages) + [detail])
+
+	widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+	for i, row in enumerate(rows):
+		print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+		if i == 0:
+			print("  ".join('-' * width for width in widths))
+
+def generate_all(versions, no_cache=False, workers=None, memory_limit=None, keep_downloads=False, minimal=None, snapshot=None):
+	# Versions are keyed by their string form, as Version objects aren't hashable
+	results = {str(v): None for v in versions}
+
+	# Decompile first, as decompilation needs far more memory than the other stages
+	sources = prepare_sources(versions, workers=workers, memory_limit=memory_limit, keep_downloads=keep_downloads, minimal=minimal, snapshot=snapshot)
+	for mc_version, (status, detail) in sources.items():
+		if status != 'ok':
+			results[mc_version] = (status, detail)
+
+	prepared = [mc_version for mc_version in results if results[mc_version] is None]
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = {executor.submit(generate_version, mc_version, no_cache): mc_version for mc_version in prepared}
+
+		for done, future in enumerate(as_completed(futures), start=1):
+			mc_version = futures[future]
+			try:
+				results[mc_version] = ('ok', {'source': sources[mc_version][1], **future.result()})
+				print(f"[{done}/{len(prepared)}] {mc_version} done in {sum(results[mc_version][1].values()):.1f}s")
+			except Exception as e:
+				results[mc_version] = ('failed', f"{type(e).__name__}: {e}")
+				print(f"[{done}/{len(prepared)}] {mc_version} failed: {e} (see {output_dir / mc_version / 'generate.log'})")
+
+	print()
+	print_summary(results)
+
+	return all(status == 'ok' for status, _ in results.values())
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(prog="generate_all", description="Generate the items list, worth.yml and BossShopPro shops for several Minecraft versions in parallel")
+	parser.add_argument('versions', nargs='+', help="The Minecraft versions to use, either individually or as inclusive ranges (such as 1.19.3..26.2)")
+	parser.add_argument('-n', '--no_cache', action='store_true', help="Regenerate everything from scratch")
+	parser.add_argument('-j', '--jobs', type=int, default=None, help="The number of versions to process at once (default: number of CPUs)")
+	parser.add_argument('-m', '--memory_limit', type=float, default=None, help="The memory, in GiB, that concurrent decompilations may use in total (default: all physical memory)")
+	parser.add_argument('-k', '--keep_downloads', action='store_true', help="Keep the downloaded jars and mappings, so they can be reused by later decompilations")
+	parser.add_argument('--minimal', action='store_true', default=None, help="Only decompile the classes the toolkit reads, rather than the whole client")
+	parser.add_argument('--snapshot', action='store_true', default=None, help="Store the needed source files in compressed snapshots and delete the decompiled trees")
+	args = parser.parse_args()
+
+	memory_limit = int(args.memory_limit * 1024 ** 3) if args.memory_limit else None
+	success = generate_all(expand_versions(args.versions), no_cache=args.no_cache, workers=args.jobs, memory_limit=memory_limit, keep_downloads=args.keep_downloads, minimal=args.minimal, snapshot=args.snapshot)
+	sys.exit(0 if success else 1)
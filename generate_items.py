@@ -11,25 +11,37 @@
 import argparse, os, json
 from pathlib import Path
 
-from DecompilerMC.main import get_latest_version
-from lib import prepare_source, get_items, Version
+from lib import Version
+from lib.instrument import add_arguments, instrument_run, stage
+from lib.output import write_output
+from lib.pipeline import get_context
+from lib.recipe import to_json
+from lib.version_manifest import get_latest_version
 
 script_dir = Path(os.path.dirname(__file__))
 output_dir = script_dir / "output"
 
-def generate_items(mc_version, no_cache=False, outpath=output_dir / "items.json"):
-	source_path = prepare_source(mc_version)
-	items = get_items(source_path, mc_version, no_cache, include_creative=True, all_recipes=True)
+def generate_items(mc_version, no_cache=False, outpath=output_dir / "items.json", delta=False):
+	context = get_context(mc_version)
+	with stage('prepare_source'):
+		context.get_source_path()
+	with stage('get_items'):
+		items = context.get_items(no_cache, include_creative=True, all_recipes=True)
 
-	os.makedirs(output_dir, exist_ok=True)
-
-	with open(outpath, 'w') as f:
-		json.dump(items, f,  ensure_ascii=False, indent=2)
+	# items.json is only rewritten when it changes; its delta lists the items whose recipes changed
+	with stage('write items.json'):
+		write_output(outpath, json.dumps(items, ensure_ascii=False, indent=2, default=to_json), items['items'], delta)
 
 if __name__ == '__main__':
 	parser = argparse.ArgumentParser(prog="generate_items", description="Generate a list of items by scanning the Minecraft source code")
-	parser.add_argument('mc_version', nargs='?', default=get_latest_version()[1], help="The Minecraft version to use")
+	parser.add_argument('mc_version', nargs='?', help="The Minecraft version to use (default: the latest release)")
 	parser.add_argument('-n', '--no_cache', action='store_true', help="Regenerate everything from scratch")
+	parser.add_argument('-d', '--delta', action='store_true', help="Also write output/items.delta.json, listing the items that changed since items.json was last generated")
+	add_arguments(parser, output_dir)
 	args = parser.parse_args()
 
-	generate_items(Version(args.mc_version), no_cache=args.no_cache)
+	# Only look up the latest version when none was given
+	mc_version = Version(args.mc_version) if args.mc_version else get_latest_version()
+
+	with instrument_run('generate_items', args.profile, args.report):
+		generate_items(mc_version, no_cache=args.no_cache, delta=args.delta)
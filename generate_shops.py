@@ -11,8 +11,12 @@
 import argparse, os, re
 from pathlib import Path
 
-from DecompilerMC.main import get_latest_version
-from lib import get_items, prepare_source, Version
+from lib import Version
+from lib.instrument import add_arguments, add_stage_time, count, instrument_run, stage
+from lib.item_registry import registry
+from lib.output import read_index, write_all_atomic
+from lib.pipeline import get_context
+from lib.version_manifest import get_latest_version
 from generate_worth import generate_worth
 
 import yaml
@@ -34,25 +38,35 @@ ignored_items = [
 	'cutstandstoneslab' # Typo in 1.17+ source code
 ]
 
-def get_worth(mc_version):
-	worth_path = output_dir / "worth.yml"
-
+def get_worth(mc_version, worth_path=output_dir / "worth.yml", no_cache=False):
 	if not worth_path.exists():
-		generate_worth(mc_version)
+		with stage('generate_worth'):
+			generate_worth(mc_version, no_cache, outpath=worth_path)
+
+	# Use what generate_worth wrote earlier in this run, unless worth.yml was changed since
+	worth = get_context(mc_version).get_worth_file(worth_path)
+	if worth is not None:
+		count('worth.yml reused')
+		return worth
 
-	worth_data = yaml.load(open(worth_path, 'r'), Loader=Loader)
+	# Otherwise use the price index generate_worth wrote alongside it, unless it doesn't match worth.yml any more
+	with stage('load worth index'):
+		worth = read_index(worth_path)
+	if worth is not None:
+		count('worth index hits')
+		return worth
+
+	with stage('load worth.yml'):
+		worth_data = yaml.load(open(worth_path, 'r'), Loader=Loader)
 
 	if 'worth' not in worth_data:
 		raise Exception('worth.yml appears to be an invalid file; missing "worth" key.')
 
 	return worth_data['worth']
 
-def generate_shops(mc_version, no_cache=False, outpath=output_dir / "BossShopPro"):
-	source_path = prepare_source(mc_version)
-	items = get_items(source_path, mc_version, no_cache)
-	worth = get_worth(mc_version)
-
-	os.makedirs(outpath, exist_ok=True)
+# Build the data for each shop file, keyed by file name
+def build_shops(items, worth):
+	shops = {}
 
 	main_shop_data = {
 		'ShopName': 'Menu',
@@ -92,7 +106,7 @@ def generate_shops(mc_version, no_cache=False, outpath=output_dir / "BossShopPro
 		}
 
 		for item in group_data['items']:
-			ikey = item.lower().replace('_', '')
+			ikey = registry.get_essentials_name(item)
 			if ikey in worth:
 				shop_data['itemshop'][ikey] = {
 					'Worth': worth[ikey],
@@ -104,19 +118,49 @@ def generate_shops(mc_version, no_cache=False, outpath=output_dir / "BossShopPro
 			elif not ikey in ignored_items:
 				print(f"Warning: item {ikey} is not in worth.yml!")
 
-		with open(outpath / 'Shop{0}.yml'.format(group_title.replace(' ', '')), 'w') as shopfile:
-			shopfile.write(yaml.dump(shop_data, Dumper=Dumper, sort_keys=False))
+		shops['Shop{0}.yml'.format(group_title.replace(' ', ''))] = shop_data
+
+	shops['Menu.yml'] = main_shop_data
+
+	return shops
 
-	with open(outpath / 'Menu.yml', 'w') as shopfile:
-		shopfile.write(yaml.dump(main_shop_data, Dumper=Dumper, sort_keys=False))
+def dump_shop(shop_data, stream=None):
+	return yaml.dump(shop_data, stream, Dumper=Dumper, sort_keys=False)
+
+def generate_shops(mc_version, no_cache=False, outpath=output_dir / "BossShopPro", worth_path=output_dir / "worth.yml", workers=None):
+	context = get_context(mc_version)
+	with stage('prepare_source'):
+		context.get_source_path()
+	with stage('get_items'):
+		items = context.get_items(no_cache)
+	with stage('get_worth'):
+		worth = get_worth(mc_version, worth_path, no_cache)
+
+	os.makedirs(outpath, exist_ok=True)
+
+	with stage('build shops'):
+		shops = build_shops(items, worth)
+
+	# Each file is dumped straight into a temporary file and renamed into place, so BossShopPro never reads a
+	# half-written shop, and files that haven't changed are left alone so it doesn't reload them
+	with stage('write shops'):
+		results = write_all_atomic(outpath, shops, lambda f, shop_data: dump_shop(shop_data, f), workers)
+		for filename, (changed, elapsed) in results.items():
+			add_stage_time(filename, elapsed)
+			count('shop files written' if changed else 'shop files unchanged')
 
 	return True
 
 if __name__ == '__main__':
 	parser = argparse.ArgumentParser(prog="generate_shops", description="Generate BossShopPro configuration files using an EssentialsX worth.yml and Minecraft deobfuscated source code")
-	parser.add_argument('mc_version', nargs='?', default=get_latest_version()[1], help="The Minecraft version to use")
+	parser.add_argument('mc_version', nargs='?', help="The Minecraft version to use (default: the latest release)")
 	parser.add_argument('-n', '--no_cache', action='store_true', help="Regenerate everything from scratch")
-	parser.add_argument('-n', '--no_cache', action='store_true')
+	parser.add_argument('-j', '--jobs', type=int, default=None, help="The number of shop files to write at once (default: chosen by Python)")
+	add_arguments(parser, output_dir)
 	args = parser.parse_args()
 
-	generate_shops(Version(args.mc_version), no_cache=args.no_cache)
+	# Only look up the latest version when none was given
+	mc_version = Version(args.mc_version) if args.mc_version else get_latest_version()
+
+	with instrument_run('generate_shops', args.profile, args.report):
+		generate_shops(mc_version, no_cache=args.no_cache, workers=args.jobs)
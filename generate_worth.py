@@ -8,11 +8,18 @@
 # Generate a worth.yml using some base values and recipes determined from Minecraft source
 #
 
-import argparse, os
+import argparse, os, json, hashlib
+from collections import deque
 from pathlib import Path
 
-from DecompilerMC.main import get_latest_version
-from lib import prepare_source, get_items, creative_only_items, Version
+from lib import creative_only_items, Version
+from lib.instrument import add_arguments, count, instrument_run, stage
+from lib.item_registry import registry
+from lib.item_tags import get_remap_table, resolve_ingredient
+from lib.output import write_output
+from lib.pipeline import get_context
+from lib.recipe import from_json, to_json
+from lib.version_manifest import get_latest_version
 
 import yaml
 try:
@@ -20,171 +27,349 @@ try:
 except ImportError:
 	from yaml import Loader, Dumper
 
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
 script_dir = Path(os.path.dirname(__file__))
 output_dir = script_dir / "output"
+worth_state_dir = output_dir / "worthcache"
 
-base_worth = yaml.load(open(script_dir / "base_worth.yml", 'r'), Loader=Loader)
+def load_base_worth():
+	with open(script_dir / "base_worth.yml", 'r') as f:
+		return yaml.load(f, Loader=Loader)
+
+base_worth = load_base_worth()
 worth_header = open(script_dir / "worth_yml_header.yml", "r").read()
 
 with open(script_dir / "latest.txt", 'r') as f:
 	latest_compatible = Version(f.read())
 
-def remap_ingredient(item_id):
-	remappings = {
-		'PLANKS': 'OAK_PLANKS',
-		'LOGS': 'OAK_LOG',
-		'LOGS_THAT_BURN': 'OAK_LOG',
-		'WOODEN_SLABS': 'OAK_SLAB',
-		'COALS': 'COAL',
-		'WOOL': 'WHITE_WOOL',
-		'SOUL_FIRE_BASE_BLOCKS': 'SOUL_SOIL',
-		'STONE_CRAFTING_MATERIALS': 'COBBLESTONE',
-		'CHISELED_QUARTZ_BLOCK/QUARTZ_PILLAR': 'QUARTZ_PILLAR',
-		'FURNACE_MATERIALS': 'COBBLESTONE',
-		'WOODEN_FENCES': 'OAK_FENCE',
-		'WOODEN_TOOL_MATERIALS': 'OAK_PLANKS',
-		'STONE_TOOL_MATERIALS': 'COBBLESTONE',
-		'IRON_TOOL_MATERIALS': 'IRON_INGOT',
-		'GOLD_TOOL_MATERIALS': 'GOLD_INGOT',
-		'DIAMOND_TOOL_MATERIALS': 'DIAMOND',
-		'EGGS': 'EGG',
-		'LEAVES': 'OAK_LEAVES',
-		'COPPER_TOOL_MATERIALS': 'COPPER_INGOT',
-		'CHAIN': 'IRON_CHAIN'
-	}
-
-	if item_id in remappings:
-		return remappings[item_id]
-
-	if '/' in item_id:
-		item_id = item_id.split('/')[0]
-	elif item_id.endswith('_LOGS'):
-		item_id = item_id.replace('_LOGS', '_LOG')
-	elif item_id.endswith('_STEMS'):
-		item_id = item_id.replace('_STEMS', '_STEM')
-	elif item_id.endswith('_BLOCKS'):
-		item_id = item_id.replace('_BLOCKS', '_BLOCK')
-
-	return item_id
-
-def add_to_worth(worth, item_id, value):
-	worth[item_id] = round(value, 2)
-
-# Calculate worth for a specific recipe
-def calculate_worth_from_recipe(items, worth, item_id):
-	recipe = items.get(item_id)
-	if not recipe:
-		if item_id not in items:
-			raise Exception(f'Item {item_id} not found!')
-		raise Exception(f'Item {item_id} has no recipe!')
+# Calculate worth for a specific recipe, from the values of its ingredients' ids
+def calculate_worth_from_recipe(recipe, ingredients, values):
+	value = 0.0
 
+	for ingredient, ic in ingredients:
+		value += values[ingredient] * ic
+
+	return value * (1.0 - ((recipe.ingredient_count - 1) / 100)) / recipe.count * get_pattern_multiplier(recipe.pattern)
+
+# Tools and cooking make an item worth a little less or more than its ingredients
+def get_pattern_multiplier(pattern):
+	if pattern in ['axe', 'shovel', 'hoe']:
+		return 0.9
+	if pattern in ['furnace', 'stonecutter']:
+		return 1.25
+	return 1.0
+
+# Get the legacy names an item's worth should also be published under
+def get_legacy_names(item):
+	if item.startswith('END_STONE_BRICK') and item != "END_STONE_BRICKS":
+		return [item.replace('_BRICK', '')]
+	if item == "MELON":
+		return ["MELON_BLOCK"]
+	if item == "SKULL_BANNER_PATTERN":
+		return ["SKELETON_BANNER_PATTERN"]
+	return []
+
+# Determine how an item's worth is derived, as a (kind, dependencies, factor) rule
+# remap resolves the recipe's ingredients, which may be tags, to the items they are priced as
+def get_worth_rule(item, recipe, remap=resolve_ingredient):
 	if type(recipe) == list:
 		recipe = recipe[0]
 
-	value = 0.0
-	ing_count = 0
+	# Ores
+	if item.endswith('_ORE'):
+		material = item.replace("NETHER_", "").replace("DEEPSLATE_", "").split('_')[0]
+		if material in ['IRON', 'COPPER', 'GOLD']:
+			material = f'RAW_{material}'
+		elif material == 'LAPIS':
+			material = 'LAPIS_LAZULI'
+		return ('scale', [material], 0.75)
+
+	# Oxidized copper blocks and doors
+	if item.startswith(("EXPOSED_", "WEATHERED_", "OXIDIZED_")):
+		base_copper_item = "CUT_COPPER" if not "DOOR" in item else "LIGHTNING_ROD" if "LIGHTNING" in item else ("COPPER_" + item.split("_COPPER_")[1])
+		return ('scale', [base_copper_item], 0.5 if item.startswith('EXPOSED') else 0.4 if item.startswith('WEATHERED') else 0.3)
+
+	# Waxed copper; a recipe for the waxed item takes precedence once the unwaxed item is priced
+	if item.startswith("WAXED_"):
+		base_item = item.replace("WAXED_", "")
+		if recipe:
+			return ('recipe', [base_item] + [i for i, ic in recipe.remap_ingredients(remap)], None)
+		return ('waxed', [base_item, 'HONEYCOMB'], 0.9)
+
+	# Damaged anvils (CHIPPED_ANVIL, DAMAGED_ANVIL)
+	if item.endswith("_ANVIL"):
+		return ('scale', ['ANVIL'], 0.5 if item == 'CHIPPED_ANVIL' else 0.25)
 
-	for i, ic in recipe['ingredients'].items():
-		ingredient = remap_ingredient(i)
-		if ingredient not in worth:
-			raise Exception(f"Ingredient {ingredient} is not defined in worth data!")
-		value += worth[ingredient] * ic
-		ing_count += ic
+	if not recipe:
+		return None # No recipe, cannot calculate
 
-	result = value * (1.0 - ((ing_count - 1) / 100)) / recipe['count']
+	return ('recipe', [i for i, ic in recipe.remap_ingredients(remap)], None)
 
-	if recipe['pattern'] in ['axe', 'shovel', 'hoe']:
-		result = result * 0.9
-	elif recipe['pattern'] in ['furnace', 'stonecutter']:
-		result = result * 1.25
+# Build the graph of items still to be priced, and the items each one depends on
+def build_worth_graph(worth, items, remap=resolve_ingredient):
+	graph = {}
+	for item, recipe in items.items():
+		if item in worth:
+			continue # Skip preset values
 
-	return result
+		rule = get_worth_rule(item, recipe, remap)
+		if rule:
+			graph[item] = rule
 
-def calculate_worth(worth, items):
-	for item, recipe in items.items():
+	return graph
 
-		if item in worth:
-			continue # Skip already calculated values
-
-		# Ores
-		if item.endswith('_ORE'):
-			material = item.replace("NETHER_", "").replace("DEEPSLATE_", "").split('_')[0]
-			if material in ['IRON', 'COPPER', 'GOLD']:
-				material = f'RAW_{material}'
-			elif material == 'LAPIS':
-				material = 'LAPIS_LAZULI'
-			add_to_worth(worth, item, worth[material] * 0.75)
-			continue
+# Find the strongly-connected groups of items that depend on each other (Tarjan's algorithm, without recursion)
+def find_cycles(edges):
+	index = {}
+	lowlink = {}
+	stack = []
+	on_stack = set()
+	cycles = []
 
-		# Oxidized copper blocks and doors
-		elif item.startswith(("EXPOSED_", "WEATHERED_", "OXIDIZED_")):
-			base_copper_item = "CUT_COPPER" if not "DOOR" in item else "LIGHTNING_ROD" if "LIGHTNING" in item else ("COPPER_" + item.split("_COPPER_")[1])
-			if not base_copper_item in worth:
-				continue # Need to wait for calculation
-			add_to_worth(worth, item, worth[base_copper_item] *
-				(0.5 if item.startswith('EXPOSED') else 0.4 if item.startswith('WEATHERED') else 0.3)
-			)
+	for root in edges:
+		if root in index:
 			continue
 
-		# Waxed copper
-		elif item.startswith("WAXED_"):
-			base_item = item.replace("WAXED_", "")
-			if not base_item in worth:
-				continue # Need to wait for calculation
-			add_to_worth(worth, item, (worth[base_item] + worth["HONEYCOMB"]) * 0.9)
-
-		# Damaged anvils (CHIPPED_ANVIL, DAMAGED_ANVIL)
-		elif item.endswith("_ANVIL"):
-			if not 'ANVIL' in worth:
-				continue # Need to wait for calculation
-			add_to_worth(worth, item, worth['ANVIL'] * (0.5 if item == 'CHIPPED_ANVIL' else 0.25))
-			continue
+		index[root] = lowlink[root] = len(index)
+		stack.append(root)
+		on_stack.add(root)
+		work = [(root, iter(edges[root]))]
+
+		while work:
+			node, children = work[-1]
+			for child in children:
+				if child not in index:
+					index[child] = lowlink[child] = len(index)
+					stack.append(child)
+					on_stack.add(child)
+					work.append((child, iter(edges[child])))
+					break
+				elif child in on_stack:
+					lowlink[node] = min(lowlink[node], index[child])
+			else:
+				work.pop()
+				if work:
+					parent = work[-1][0]
+					lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+				if lowlink[node] == index[node]:
+					component = []
+					while True:
+						member = stack.pop()
+						on_stack.discard(member)
+						component.append(member)
+						if member == node:
+							break
+					if len(component) > 1 or node in edges[node]:
+						cycles.append(component[::-1])
+
+	return cycles
+
+# Prices for legacy names come from the item they are an alias of
+def get_alias_sources(graph):
+	return {alias: item for item, rule in graph.items() if rule[0] == 'recipe' for alias in get_legacy_names(item)}
+
+# Find every item of the graph whose worth depends, directly or not, on any of the given items
+def find_downstream(graph, changed):
+	alias_sources = get_alias_sources(graph)
+
+	dependents = {}
+	for item, (kind, deps, factor) in graph.items():
+		for dep in deps:
+			dependents.setdefault(alias_sources.get(dep, dep), []).append(item)
+
+	downstream = set()
+	queue = deque(changed)
+	while queue:
+		for dependent in dependents.get(queue.popleft(), []):
+			if dependent not in downstream:
+				downstream.add(dependent)
+				queue.append(dependent)
+
+	return downstream
+
+# Get an item's recipe for pricing
+def get_priced_recipe(items, item_id):
+	recipe = items.get(item_id)
+	if not recipe:
+		if item_id not in items:
+			raise Exception(f'Item {item_id} not found!')
+		raise Exception(f'Item {item_id} has no recipe!')
 
-		if not recipe:
-			continue # No recipe, cannot calculate
+	if type(recipe) == list:
+		recipe = recipe[0]
 
-		if type(recipe) == list:
-			recipe = recipe[0]
+	return recipe
+
+# Work out the order the items of the graph can be priced in, without pricing them, as rules over item ids
+def compile_worth_graph(worth, items, graph):
+	alias_sources = get_alias_sources(graph)
+
+	pending = {}
+	dependents = {}
+	missing = {}
+	presets = {}
+	for item, (kind, deps, factor) in graph.items():
+		pending[item] = set()
+		for dep in deps:
+			if dep in worth:
+				presets[dep] = True
+				continue
+			dep = alias_sources.get(dep, dep)
+			if dep not in graph:
+				missing.setdefault(item, []).append(dep)
+			pending[item].add(dep)
+			dependents.setdefault(dep, []).append(item)
+
+	order = []
+	ready = deque(item for item in graph if not pending[item])
+	while ready:
+		item = ready.popleft()
+		order.append(item)
+
+		for dependent in dependents.get(item, []):
+			pending[dependent].discard(item)
+			if not pending[dependent]:
+				ready.append(dependent)
+
+	get_id = registry.get_id
+	rules = []
+	priced = []
+	for item in order:
+		kind, deps, factor = graph[item]
+		item_id = get_id(item)
+		dep_ids = [get_id(dep) for dep in deps]
+		priced.append(item_id)
+
+		if kind == 'recipe':
+			recipe = get_priced_recipe(items, item)
+			# A recipe rule's dependencies end with the recipe's remapped ingredients, in order
+			ingredients = tuple(zip(dep_ids[len(dep_ids) - len(recipe.ingredients):], [ic for i, ic in recipe.ingredients]))
+			aliases = [get_id(alias) for alias in get_legacy_names(item)]
+			priced += aliases
+			rules.append((item_id, kind, dep_ids, factor, recipe, ingredients, aliases))
+		else:
+			rules.append((item_id, kind, dep_ids, factor, None, None, []))
+
+	return {
+		'rules': rules,
+		'presets': {get_id(item): item for item in presets},
+		'priced': priced,
+		'pending': pending,
+		'missing': missing
+	}
 
-		can_calc = True
-		for ing in recipe['ingredients'].keys():
-			if remap_ingredient(ing) not in worth:
-				can_calc = False
-				break
+# Price compiled rules in order, reading and writing an array of values indexed by item id
+def price_rules(rules, values):
+	for item_id, kind, deps, factor, recipe, ingredients, aliases in rules:
+		if kind == 'scale':
+			values[item_id] = round(values[deps[0]] * factor, 2)
+		elif kind == 'waxed':
+			values[item_id] = round((values[deps[0]] + values[deps[1]]) * factor, 2)
+		else:
+			values[item_id] = round(calculate_worth_from_recipe(recipe, ingredients, values), 2)
+
+			# Handle legacy names
+			for alias_id in aliases:
+				values[alias_id] = values[item_id]
+
+# Price every item of the graph in dependency order
+def solve_worth(worth, items, graph):
+	count('worth passes')
+	compiled = compile_worth_graph(worth, items, graph)
+
+	values = registry.new_values()
+	for item_id, item in compiled['presets'].items():
+		values[item_id] = worth[item]
+
+	price_rules(compiled['rules'], values)
+
+	names = registry.names
+	for item_id in compiled['priced']:
+		worth[names[item_id]] = values[item_id]
+
+	pending = compiled['pending']
+	unresolved = {item: [dep for dep in pending[item] if dep in graph] for item in graph if item not in worth}
+	count('items priced', len(graph) - len(unresolved))
+
+	return {
+		'cycles': find_cycles(unresolved),
+		'missing': compiled['missing']
+	}
 
-		if not can_calc:
-			continue
+def calculate_worth(worth, items, remap=resolve_ingredient):
+	return solve_worth(worth, items, build_worth_graph(worth, items, remap))
 
-		add_to_worth(worth, item, calculate_worth_from_recipe(items, worth, item))
+def remap_names_for_essentials(worth):
+	registry.register_all(worth)
+	essentials_names = registry.essentials_names
+	return {essentials_names[item]: value for item, value in worth.items()}
 
-		# Handle legacy names
-		if item.startswith('END_STONE_BRICK') and item != "END_STONE_BRICKS":
-			worth[item.replace('_BRICK', '')] = worth[item]
-		elif item == "MELON":
-			worth["MELON_BLOCK"] = worth['MELON']
-		elif item == "SKULL_BANNER_PATTERN":
-			worth["SKELETON_BANNER_PATTERN"] = worth["SKULL_BANNER_PATTERN"]
+def get_worth_state_path(mc_version):
+	return worth_state_dir / f"{mc_version}.json"
 
-def remap_names_for_essentials(worth):
-	new_worth = {}
-	for item, value in worth.items():
-		new_worth[item.replace('_', '').lower()] = value
-	return new_worth
+def format_worth_yml(worth, mc_version, essentials=True):
+	if essentials:
+		worth = remap_names_for_essentials(worth)
 
-def generate_worth(mc_version, no_cache=False, outpath=output_dir / "worth.yml", essentials=True):
+	return worth_header.replace("<-latest->", str(mc_version)) + "\n\n" + yaml.dump({'worth': worth}, Dumper=Dumper)
+
+# Write worth.yml, unless it would be unchanged; returns the digest of its contents
+def write_worth_yml(worth, mc_version, outpath, essentials=True, delta=False):
+	entries = remap_names_for_essentials(worth) if essentials else worth
+	digest = write_output(outpath, format_worth_yml(entries, mc_version, essentials=False), entries, delta, index=True)[0]
+	get_context(mc_version).set_worth_file(outpath, digest, entries)
+	return digest
+
+# Save everything needed to reprice items later without reloading them
+def save_worth_state(mc_version, base, graph, items, worth, essentials, digest):
+	os.makedirs(worth_state_dir, exist_ok=True)
+	with open(get_worth_state_path(mc_version), 'w') as statefile:
+		json.dump({
+			'version': str(mc_version),
+			'base': base,
+			'graph': graph,
+			'items': {item: items[item] for item, rule in graph.items() if rule[0] == 'recipe'},
+			'worth': worth,
+			'essentials': essentials,
+			'digest': digest
+		}, statefile, default=to_json)
+
+def load_worth_state(mc_version):
+	state_path = get_worth_state_path(mc_version)
+	if not state_path.exists():
+		return None
+
+	with open(state_path, 'r') as statefile:
+		state = json.load(statefile)
+
+	state['graph'] = {item: tuple(rule) for item, rule in state['graph'].items()}
+	state['items'] = {item: from_json(recipe) for item, recipe in state['items'].items()}
+	return state
+
+def generate_worth(mc_version, no_cache=False, outpath=output_dir / "worth.yml", essentials=True, delta=False):
 	if latest_compatible < mc_version:
 		print(f"Warning, script may fail; script is written for MC {latest_compatible} or earlier but MC {mc_version} was requested")
 
-	source_path = prepare_source(mc_version)
-	items = get_items(source_path, mc_version, no_cache)['items']
-	worth = base_worth
+	context = get_context(mc_version)
+	with stage('prepare_source'):
+		source_path = context.get_source_path()
+	with stage('get_items'):
+		items = context.get_items(no_cache)['items']
+	with stage('resolve tags'):
+		remap = get_remap_table(source_path, mc_version, items, no_cache)
+	worth = dict(base_worth)
+
+	with stage('calculate worth'):
+		graph = build_worth_graph(worth, items, remap)
+		report = solve_worth(worth, items, graph)
 
-	calculated_items = len(worth.keys())
-	while True:
-		calculate_worth(worth, items)
-		if len(worth.keys()) == calculated_items:
-			break # We aren't able to calculate any more recipes
-		calculated_items = len(worth.keys())
+	for cycle in report['cycles']:
+		print('Recipe cycle detected, cannot calculate:', ' -> '.join(cycle + [cycle[0]]))
 
 	for i in items:
 		if i not in worth:
@@ -192,21 +377,224 @@ def generate_worth(mc_version, no_cache=False, outpath=output_dir / "worth.yml",
 		elif worth[i] == 0.0:
 			print(f'{i} resulted in a value of 0.00, calculation error!')
 
+	with stage('write worth.yml'):
+		digest = write_worth_yml(worth, mc_version, outpath, essentials, delta)
+		save_worth_state(mc_version, dict(base_worth), graph, items, worth, essentials, digest)
+
+# Update worth.yml after changes to base_worth.yml, only repricing the items affected by the changes
+def reprice_worth(mc_version, outpath=output_dir / "worth.yml", essentials=True, delta=False):
+	state = load_worth_state(mc_version)
+
+	if state is None or any(item not in base_worth for item in state['base']):
+		# Items that lost their preset price need their recipes, so everything has to be regenerated
+		print("Cannot reprice incrementally, regenerating worth.yml in full...")
+		return generate_worth(mc_version, outpath=outpath, essentials=essentials, delta=delta)
+
+	changed = [item for item, value in base_worth.items() if state['base'].get(item) != value]
+	graph = {item: rule for item, rule in state['graph'].items() if item not in base_worth}
+	stale = find_downstream(graph, changed)
+	stale.update(alias for item in stale for alias in get_legacy_names(item))
+
+	worth = {item: value for item, value in state['worth'].items() if item not in stale}
+	worth.update({item: base_worth[item] for item in changed})
+	solve_worth(worth, state['items'], {item: graph[item] for item in graph if item in stale})
+
+	# Keep the previous ordering, so that names which collide once remapped resolve the same way
+	new_worth = {item: worth[item] for item in state['worth'] if item in worth}
+	new_worth.update(worth)
+
+	print(f"{len(changed)} base price(s) changed, repriced {len(stale)} dependent item(s)")
+
+	old_entries = remap_names_for_essentials(state['worth']) if essentials else state['worth']
+	new_entries = remap_names_for_essentials(new_worth) if essentials else new_worth
+	updated = [key for key, value in new_entries.items() if old_entries.get(key) != value]
+
+	contents = None
+	if Path(outpath).exists() and state['version'] == str(mc_version) and state['essentials'] == essentials and set(old_entries) == set(new_entries):
+		with open(outpath, 'r') as worthfile:
+			contents = worthfile.read()
+		if hashlib.sha256(contents.encode()).hexdigest() != state['digest']:
+			contents = None # worth.yml was modified since it was generated
+
+	if contents is not None:
+		# Rewrite only the entries whose worth changed
+		lines = contents.splitlines(keepends=True)
+		positions = {line: i for i, line in enumerate(lines)}
+		for key in updated:
+			old_line = "  " + yaml.dump({key: old_entries[key]}, Dumper=Dumper)
+			if old_line not in positions:
+				contents = None
+				break
+			lines[positions[old_line]] = "  " + yaml.dump({key: new_entries[key]}, Dumper=Dumper)
+
+	if contents is None:
+		digest = write_worth_yml(new_worth, mc_version, outpath, essentials, delta)
+	else:
+		digest = write_output(outpath, "".join(lines), new_entries, delta, index=True)[0]
+		get_context(mc_version).set_worth_file(outpath, digest, new_entries)
+
+	save_worth_state(mc_version, dict(base_worth), graph, state['items'], new_worth, essentials, digest)
+
+	return updated
+
+# Load pricing scenarios: each one is a set of changes to base_worth.yml, made of an optional multiplier for every
+# base price and prices for specific items
+def load_scenarios(scenarios_path):
+	scenarios = {}
+	for name, changes in yaml.load(open(scenarios_path, 'r'), Loader=Loader).items():
+		changes = dict(changes or {})
+		multiplier = changes.pop('multiplier', 1)
+		scenario = {item: value * multiplier for item, value in base_worth.items()}
+
+		for item, value in changes.items():
+			# Pricing an item that base_worth.yml doesn't would change which items are derived from recipes
+			if item not in base_worth:
+				raise Exception(f'Scenario {name} prices {item}, which is not in base_worth.yml; scenarios can only change base prices')
+			scenario[item] = value
+
+		scenarios[str(name)] = scenario
+
+	return scenarios
+
+# Get a compiled rule as weights for the values of its dependencies, to be summed then multiplied by a factor,
+# divided by a count and multiplied by a pattern multiplier, in the same order price_rules works them out
+def get_rule_terms(rule):
+	item_id, kind, deps, factor, recipe, ingredients, aliases = rule
+	if kind == 'scale':
+		return [deps[0]], [1.0], factor, 1, 1.0
+	if kind == 'waxed':
+		return deps[:2], [1.0, 1.0], factor, 1, 1.0
+	return [i for i, ic in ingredients], [ic for i, ic in ingredients], 1.0 - ((recipe.ingredient_count - 1) / 100), recipe.count, get_pattern_multiplier(recipe.pattern)
+
+# Group compiled rules into levels, where each rule only depends on base prices and on the rules of earlier levels
+def get_rule_levels(rules):
+	depths = {}
+	levels = []
+	for rule in rules:
+		item_id, kind, deps, factor, recipe, ingredients, aliases = rule
+		depth = max([depths.get(dep, -1) for dep in deps], default=-1) + 1
+		depths[item_id] = depth
+		for alias_id in aliases:
+			depths[alias_id] = depth
+
+		if depth == len(levels):
+			levels.append([])
+		levels[depth].append(rule)
+
+	return levels
+
+# Round a matrix of prices to the cent like round() does
+# NumPy rounds by scaling up, which can land a price on the other side of a half cent, so prices close to one are left to round()
+def round_cents(values):
+	scaled = values * 100
+	rounded = np.round(scaled) / 100
+
+	for index in zip(*np.nonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)):
+		rounded[index] = round(float(values[index]), 2)
+
+	return rounded
+
+# Price a compiled graph for every scenario at once, one level at a time, as a matrix of values with a column per scenario
+def price_scenarios_numpy(compiled, scenarios):
+	values = np.zeros((len(registry), len(scenarios)))
+	for item_id, item in compiled['presets'].items():
+		values[item_id] = [scenario[item] for scenario in scenarios]
+
+	for level in get_rule_levels(compiled['rules']):
+		terms = [get_rule_terms(rule) for rule in level]
+		width = max(len(dep_ids) for dep_ids, weights, factor, divisor, multiplier in terms)
+
+		# Rules with fewer dependencies are padded with weights of zero
+		dep_ids = np.zeros((len(level), width), dtype=np.intp)
+		weights = np.zeros((len(level), width))
+		for row, (rule_dep_ids, rule_weights, factor, divisor, multiplier) in enumerate(terms):
+			dep_ids[row, :len(rule_dep_ids)] = rule_dep_ids
+			weights[row, :len(rule_weights)] = rule_weights
+
+		factors = np.array([[term[2]] for term in terms])
+		divisors = np.array([[term[3]] for term in terms])
+		multipliers = np.array([[term[4]] for term in terms])
+
+		sums = (values[dep_ids] * weights[:, :, None]).sum(axis=1)
+		values[[rule[0] for rule in level]] = round_cents(sums * factors / divisors * multipliers)
 
-	os.makedirs(output_dir, exist_ok=True)
-
-	if essentials:
-		worth = remap_names_for_essentials(worth)
-
-	with open(outpath, 'w') as worthfile:
-		worthfile.write(worth_header.replace("<-latest->", str(mc_version)) + "\n\n")
-		worthfile.write(yaml.dump({'worth': worth}, Dumper=Dumper))
+		# Handle legacy names
+		for rule in level:
+			for alias_id in rule[6]:
+				values[alias_id] = values[rule[0]]
+
+	return [values[:, column].tolist() for column in range(len(scenarios))]
+
+# Price a compiled graph for every scenario, returning a list of values indexed by item id for each one
+def price_scenarios(compiled, scenarios):
+	if np is not None:
+		return price_scenarios_numpy(compiled, scenarios)
+
+	priced = []
+	for scenario in scenarios:
+		values = registry.new_values()
+		for item_id, item in compiled['presets'].items():
+			values[item_id] = scenario[item]
+		price_rules(compiled['rules'], values)
+		priced.append(values)
+
+	return priced
+
+# Work out worth for many alternative sets of base prices, returning a worth map for each scenario
+def calculate_scenario_worths(items, scenarios, remap=resolve_ingredient):
+	graph = build_worth_graph(base_worth, items, remap)
+	compiled = compile_worth_graph(base_worth, items, graph)
+	names = registry.names
+
+	worths = {}
+	for name, values in zip(scenarios, price_scenarios(compiled, list(scenarios.values()))):
+		worth = dict(scenarios[name])
+		for item_id in compiled['priced']:
+			worth[names[item_id]] = values[item_id]
+		worths[name] = worth
+
+	count('scenarios priced', len(scenarios))
+	return worths
+
+# Generate a worth.yml for every scenario in a scenarios file, as <scenario>.yml in outdir
+def generate_scenarios(mc_version, scenarios_path, no_cache=False, outdir=output_dir / "scenarios", essentials=True):
+	scenarios = load_scenarios(scenarios_path)
+
+	context = get_context(mc_version)
+	with stage('prepare_source'):
+		source_path = context.get_source_path()
+	with stage('get_items'):
+		items = context.get_items(no_cache)['items']
+	with stage('resolve tags'):
+		remap = get_remap_table(source_path, mc_version, items, no_cache)
+
+	with stage('price scenarios'):
+		worths = calculate_scenario_worths(items, scenarios, remap)
+
+	with stage('write scenarios'):
+		for name, worth in worths.items():
+			write_worth_yml(worth, mc_version, outdir / f"{name}.yml", essentials)
+
+	print(f"Priced {len(worths)} scenario(s) into {outdir}")
 
 if __name__ == '__main__':
 	parser = argparse.ArgumentParser(prog="generate_worth", description="Generate an EssentialsX worth.yml file based on Minecraft recipes and a few base prices")
-	parser.add_argument('mc_version', nargs='?', default=get_latest_version()[1], help="The Minecraft version to use")
+	parser.add_argument('mc_version', nargs='?', help="The Minecraft version to use (default: the latest release)")
 	parser.add_argument('-n', '--no_cache', action='store_true', help="Regenerate everything from scratch")
 	parser.add_argument('-v', '--vanilla', action='store_true', help="Use vanilla item names, instead of the remappings EssentialsX wishes to use")
+	parser.add_argument('-i', '--incremental', action='store_true', help="Only reprice the items affected by changes to base_worth.yml since the last run")
+	parser.add_argument('-d', '--delta', action='store_true', help="Also write output/worth.delta.json, listing the entries that changed since worth.yml was last generated")
+	parser.add_argument('-s', '--scenarios', type=Path, help="Price every scenario in the given YAML file, writing output/scenarios/<scenario>.yml for each one instead of worth.yml")
+	add_arguments(parser, output_dir)
 	args = parser.parse_args()
 
-	generate_worth(Version(args.mc_version), no_cache=args.no_cache, essentials=not args.vanilla)
+	# Only look up the latest version when none was given
+	mc_version = Version(args.mc_version) if args.mc_version else get_latest_version()
+
+	with instrument_run('generate_worth', args.profile, args.report):
+		if args.scenarios:
+			generate_scenarios(mc_version, args.scenarios, no_cache=args.no_cache, essentials=not args.vanilla)
+		elif args.incremental:
+			reprice_worth(mc_version, essentials=not args.vanilla, delta=args.delta)
+		else:
+			generate_worth(mc_version, no_cache=args.no_cache, essentials=not args.vanilla, delta=args.delta)
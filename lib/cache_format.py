@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/cache_format
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# The formats the item cache in output/itemcache can be stored in
+#
+
+import os, json, pickle
+
+from .recipe import to_json
+
+try:
+	import msgpack
+except ImportError:
+	msgpack = None
+
+# JSON is readable and always available. Pickles keep recipes as they are, and store every name only once; they
+# can run code when loaded, so only use them for caches nobody else can write to. msgpack needs the msgpack package.
+formats = {
+	'json': {
+		'extension': '.json',
+		'binary': False,
+		'native': False,
+		'load': json.load,
+		'dump': lambda data, f: json.dump(data, f, default=to_json)
+	},
+	'pickle': {
+		'extension': '.pickle',
+		'binary': True,
+		'native': True,
+		'load': pickle.load,
+		'dump': lambda data, f: pickle.dump(data, f, protocol=5)
+	}
+}
+
+if msgpack:
+	formats['msgpack'] = {
+		'extension': '.msgpack',
+		'binary': True,
+		'native': False,
+		'load': lambda f: msgpack.unpack(f, raw=False),
+		'dump': lambda data, f: msgpack.pack(data, f, default=to_json)
+	}
+
+# What loading a truncated or otherwise broken cache file can raise, in any format
+load_errors = (ValueError, EOFError, pickle.UnpicklingError)
+
+def get_cache_format(name):
+	if name == 'msgpack' and msgpack is None:
+		print("Warning: the msgpack package is not installed, so the item cache will be stored as JSON")
+		name = 'json'
+	if name not in formats:
+		raise Exception(f"Unknown cache format {name}; the formats are {', '.join(formats)}")
+	return dict(formats[name], name=name)
+
+# Set MC_TOOLKIT_CACHE_FORMAT to pickle or msgpack to store the item cache in a binary format
+cache_format = get_cache_format(os.environ.get('MC_TOOLKIT_CACHE_FORMAT', '') or 'json')
+
+def load_cache(path):
+	with open(path, 'rb' if cache_format['binary'] else 'r') as f:
+		return cache_format['load'](f)
+
+def dump_cache(data, path):
+	with open(path, 'wb' if cache_format['binary'] else 'w') as f:
+		cache_format['dump'](data, f)
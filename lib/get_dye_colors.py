@@ -9,18 +9,22 @@
 #
 
 import re
-from pathlib import Path
+
+from .source_reader import read_lines
 
 def get_dye_colors(source_path):
 	dye_colors = []
 
 	# Get all dye colors
-	with open(Path(f"{source_path}/world/item/DyeColor.java")) as dcj:
-		for line in dcj.readlines():
-			# match = re.match(r'^\s+public static final /\* enum \*/ DyeColor ([\w_]+) = new DyeColor\(', line)
-			match = re.match(r'^\s+(\w+)\(\d+, "\w+", ', line)
-			if match:
-				dye_colors.append(match.group(1))
-				continue
+	for line in read_lines(source_path, "world/item/DyeColor.java"):
+		# match = re.match(r'^\s+public static final /\* enum \*/ DyeColor ([\w_]+) = new DyeColor\(', line)
+		match = re.match(r'^\s+(\w+)\(\d+, "\w+", ', line)
+		if match:
+			dye_colors.append(match.group(1))
+
+			# The last enum constant ends with a semicolon, and nothing after it is needed
+			if line.rstrip().endswith(';'):
+				break
+			continue
 
 	return dye_colors
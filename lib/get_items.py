@@ -8,104 +8,166 @@
 # Get items list from the Minecraft source code, sorted by creative mode tabs
 #
 
-import os, re, json
-from pathlib import Path
+import os, re
 
 from .creative_only_items import creative_only_items
 from .get_recipes import get_recipes
+from .recipe import from_json
 from .get_dye_colors import get_dye_colors
+from .instrument import count, stage
 from .item_substitutions import item_substitutions
+from .cache_format import cache_format, load_cache, dump_cache, load_errors
+from .source_cache import cache_dir, cached_parse, get_manifest, is_cache_valid, save_manifest
+from .source_reader import finditer_first_per_line, map_source, read_lines
 from .version import Version
 
-cache_dir = Path(os.path.dirname(__file__)) / "../output/itemcache"
+item_declaration_regex = re.compile(rb"public static final (Item|WeatheringCopperItems|ColorCollection<Item>) (\w+) = ")
+
+# Every event in CreativeModeTabs.java, as one pattern with a named alternative for each kind
+# The lookahead lets the regex engine skip straight to the characters an event can start with
+creative_tab_regex = re.compile(
+	rb"(?=[RCo])(?:(?P<tab>(?:Registry\.register\(registry, (?P<tab_name>[\w_]+), )?CreativeModeTab\.builder\(CreativeModeTab\.Row\.(?:TOP|BOTTOM), \d+\)\.title\(Component.translatable\(\"itemGroup\.\w+\"\)\)\.icon\(\(\) -> new ItemStack\((?:Items|Blocks)\.(?P<tab_icon>\w+)\)\)(?:\.alignedRight\(\))?\.displayItems\(\((?:parameters|itemDisplayParameters|featureFlagSet)(?:, output)?(?:, (?:bl|buildingBlocks))?\) -> {)"
+	rb"|output\.accept\(Items\.(?P<accept>[\w_]+)\);"
+	rb"|CreativeModeTabs\.(?P<generator>generateFireworksAllDurations|generateSuspiciousStews|generateEnchantmentBookTypesOnlyMaxLevel)\("
+	rb"|CreativeModeTabs\.generateInstrumentTypes\(output, registryLookup, Items\.(?P<instrument>GOAT_HORN)"
+	rb"|CreativeModeTabs\.generatePotionEffectTypes\(output, registryLookup, Items\.(?P<potion>[\w_]+))"
+)
+
+# The item each generator call adds, and its precedence when a line has several item events
+creative_tab_generators = {
+	b'generateFireworksAllDurations': (1, 'FIREWORK_ROCKET'),
+	b'generateSuspiciousStews': (2, 'SUSPICIOUS_STEW'),
+	b'generateEnchantmentBookTypesOnlyMaxLevel': (4, 'ENCHANTED_BOOK'),
+}
+
+# Scan the item declarations in Items.java, yielding ('item', kind, name) events
+def scan_item_declarations(buffer):
+	for match in finditer_first_per_line(item_declaration_regex, buffer):
+		yield 'item', match.group(1).decode(), match.group(2).decode()
+
+# Scan CreativeModeTabs.java, yielding ('tab', name, icon) and ('item', name) events
+# Only one item is taken from each line, preferring output.accept over the generator calls as when reading line by line
+def scan_creative_tabs(buffer):
+	line_start = -1
+	tab = None
+	item = None
+
+	for match in creative_tab_regex.finditer(buffer):
+		start = buffer.rfind(b'\n', 0, match.start()) + 1
+		if start != line_start:
+			if tab:
+				yield tab
+			if item:
+				yield 'item', item[1]
+			line_start, tab, item = start, None, None
+
+		kind = match.lastgroup
+		if kind == 'tab':
+			if not tab:
+				name = match.group('tab_name')
+				tab = ('tab', name.decode() if name else None, match.group('tab_icon').decode())
+			continue
+
+		if kind == 'accept':
+			rank, name = 0, match.group(kind).decode()
+		elif kind == 'generator':
+			rank, name = creative_tab_generators[match.group(kind)]
+		elif kind == 'instrument':
+			rank, name = 3, 'GOAT_HORN'
+		else:
+			rank, name = 5, match.group(kind).decode()
+
+		if not item or rank < item[0]:
+			item = (rank, name)
+
+	if tab:
+		yield tab
+	if item:
+		yield 'item', item[1]
+
+# Get the items declared in Items.java, as [item, has_recipe] pairs in declaration order
+def get_declared_items(source_path, include_creative, dye_colors):
+	declared = []
+
+	with map_source(source_path, "world/item/Items.java") as buffer:
+		for _, kind, item in scan_item_declarations(buffer):
+			item = item_substitutions.get(item, item) # Fix any typos present in source code
+
+			if not include_creative and item in creative_only_items:
+				continue
 
-# Get items list (MC 1.19.3 and above)
-def get_items(source_path, mc_version, include_creative=False, all_recipes=False):
-	items = {}
-	categories = {}
-	recipes = get_recipes(source_path, mc_version, simplest_only=not all_recipes)
+			if kind == "ColorCollection<Item>":
+				for c in dye_colors:
+					declared.append([c + "_" + item, True])
+				continue
 
-	dye_colors = get_dye_colors(source_path)
+			declared.append([item, True])
 
-	itemsjava = Path(f"{source_path}/world/item/Items.java")
-	with open(str(itemsjava), 'r') as ij:
-		for line in ij.readlines():
-			match = re.search(rf"public static final (Item|WeatheringCopperItems|ColorCollection<Item>) (\w+) = ", line)
-			if match:
-				item = match.group(2)
-				item = item_substitutions.get(item, item) # Fix any typos present in source code
+			if kind == "WeatheringCopperItems":
+				for mod in ["EXPOSED_", "WEATHERED_", "OXIDIZED_", "WAXED_", "WAXED_EXPOSED_", "WAXED_WEATHERED_", "WAXED_OXIDIZED_"]:
+					declared.append([mod + item, True])
 
-				if not include_creative and item in creative_only_items:
-					continue
+			if item == "WRITABLE_BOOK":
+				declared.append(["WRITTEN_BOOK", False])
+			elif item == "MAP":
+				declared.append(["FILLED_MAP", False])
 
-				if match.group(1) == "ColorCollection<Item>":
-					for c in dye_colors:
-						items[c + "_" + item] = recipes.get(c + "_" + item)
-					continue
+	return declared
 
-				items[item] = recipes.get(item)
+# Get the items shown in each creative mode tab
+def get_creative_categories(source_path, include_creative):
+	categories = {}
 
-				if match.group(1) == "WeatheringCopperItems":
-					for mod in ["EXPOSED_", "WEATHERED_", "OXIDIZED_", "WAXED_", "WAXED_EXPOSED_", "WAXED_WEATHERED_", "WAXED_OXIDIZED_"]:
-						items[mod + item] = recipes.get(mod + item)
+	current_group = None
 
-				if item == "WRITABLE_BOOK":
-					items["WRITTEN_BOOK"] = None
-				elif item == "MAP":
-					items["FILLED_MAP"] = None
+	with map_source(source_path, "world/item/CreativeModeTabs.java") as buffer:
+		for event in scan_creative_tabs(buffer):
+			if event[0] == 'tab':
+				current_group = event[1:]
+				continue
 
-	with open(Path(f"{source_path}/world/item/CreativeModeTabs.java")) as cmtj:
-		current_group = None
+			if not include_creative and current_group and current_group[0] in ['SPAWN_EGGS', 'OP_BLOCKS']:
+				# Skip creative-only items
+				continue
 
-		# Reading source code line by line to avoid regex backtracking issues
-		for line in cmtj.readlines():
-			groupmatch = re.search(r"(?:Registry\.register\(registry, ([\w_]+), )?CreativeModeTab\.builder\(CreativeModeTab\.Row\.(?:TOP|BOTTOM), \d+\)\.title\(Component.translatable\(\"itemGroup\.\w+\"\)\)\.icon\(\(\) -> new ItemStack\((?:Items|Blocks)\.(\w+)\)\)(?:\.alignedRight\(\))?\.displayItems\(\((parameters|itemDisplayParameters|featureFlagSet)(?:, output)?(?:, (?:bl|buildingBlocks))?\) -> {", line)
-			if groupmatch:
-				current_group = groupmatch
+			item = item_substitutions.get(event[1], event[1]) # Fix any typos present in source code
 
-			if not include_creative and current_group and current_group.group(1) in ['SPAWN_EGGS', 'OP_BLOCKS']:
-				# Skip creative-only items
+			if not include_creative and item in creative_only_items:
 				continue
 
-			item = None
-			itemmatch = re.search(r"output\.accept\(Items\.([\w_]+)\);", line)
-			if itemmatch:
-				item = itemmatch.group(1)
-			elif 'CreativeModeTabs.generateFireworksAllDurations(' in line:
-				item = 'FIREWORK_ROCKET'
-			elif 'CreativeModeTabs.generateSuspiciousStews(' in line:
-				item = "SUSPICIOUS_STEW"
-			elif 'CreativeModeTabs.generateInstrumentTypes(output, registryLookup, Items.GOAT_HORN' in line:
-				item = "GOAT_HORN"
-			elif 'CreativeModeTabs.generateEnchantmentBookTypesOnlyMaxLevel(' in line:
-				item = 'ENCHANTED_BOOK'
-			else:
-				potionmatch = re.search(r"CreativeModeTabs\.generatePotionEffectTypes\(output, registryLookup, Items\.([\w_]+)", line)
-				if potionmatch:
-					item = potionmatch.group(1)
+			group = current_group[0]
+			if group not in categories:
+				categories[group] = {
+					'block': current_group[1],
+					'items': []
+				}
 
-			if item:
-				item = item_substitutions.get(item, item) # Fix any typos present in source code
-				recipe = recipes.get(item)
+			categories[group]['items'].append(item)
+
+	return categories
+
+# Get items list (MC 1.19.3 and above)
+def get_items(source_path, mc_version, include_creative=False, all_recipes=False, no_cache=False):
+	items = {}
+	with stage('get_recipes'):
+		recipes = get_recipes(source_path, mc_version, simplest_only=not all_recipes, no_cache=no_cache)
 
-				if not include_creative and item in creative_only_items:
-					continue
+	dye_colors = get_dye_colors(source_path)
 
-				group = current_group.group(1)
-				if group not in categories:
-					categories[group] = {
-						'block': current_group.group(2),
-						'items': []
-					}
+	suffix = "_creative" if include_creative else ""
+	declared = cached_parse("items" + suffix, source_path, mc_version, ["world/item/Items.java", "world/item/DyeColor.java"], lambda: get_declared_items(source_path, include_creative, dye_colors), no_cache=no_cache)
+	categories = cached_parse("categories" + suffix, source_path, mc_version, ["world/item/CreativeModeTabs.java"], lambda: get_creative_categories(source_path, include_creative), no_cache=no_cache)
 
-				categories[group]['items'].append(item)
+	for item, has_recipe in declared:
+		items[item] = recipes.get(item) if has_recipe else None
 
 	return dict(items=items, categories=categories)
 
 # Get items list (MC 1.13 through 1.19.2)
-def get_items_legacy(source_path, mc_version, include_creative=False, all_recipes=False):
+def get_items_legacy(source_path, mc_version, include_creative=False, all_recipes=False, no_cache=False):
 	items = {}
-	recipes = get_recipes(source_path, mc_version, simplest_only=not all_recipes)
+	with stage('get_recipes'):
+		recipes = get_recipes(source_path, mc_version, simplest_only=not all_recipes, no_cache=no_cache)
 
 	categories = {
 		'BUILDING_BLOCKS': {
@@ -151,57 +213,64 @@ def get_items_legacy(source_path, mc_version, include_creative=False, all_recipe
 	}
 
 	itemgroupname = 'CreativeModeTab'
-	itemgroupjava = Path(f"{source_path}/world/item/{itemgroupname}.java")
-	itemsjava = Path(f"{source_path}/world/item/Items.java")
-
-	with open(str(itemgroupjava), 'r') as igj:
-		for line in igj.readlines():
-			match = re.search(rf"public static final {itemgroupname} (\w+) = \(?new {itemgroupname}\((\d+), \"(\w+)\"\) {{", line)
-			if match:
-				items[match.group(1).replace('TAB_', '')]['items'] = []
-
-	with open(str(itemsjava), 'r') as ij:
-		for line in ij.readlines():
-			match = re.search(rf"public static final Item (\w+) = .+{itemgroupname}\.(\w+).+", line)
-			item = None
-			group = 'MISC'
-			if match:
-				item = match.group(1)
-
-				group = match.group(2).replace('TAB_', '')
-				if group not in items:
-					group = 'MISC'
-			else:
-				match2 = re.search(r"public static final Item (\w+) = .+", line)
-				if match2:
-					item = match2.group(1)
-
-			if item:
-				item = item_substitutions.get(item, item) # Fix any typos present in source code
-
-				if not include_creative and item in creative_only_items:
-					continue
+	for line in read_lines(source_path, f"world/item/{itemgroupname}.java"):
+		match = re.search(rf"public static final {itemgroupname} (\w+) = \(?new {itemgroupname}\((\d+), \"(\w+)\"\) {{", line)
+		if match:
+			group = match.group(1).replace('TAB_', '')
+			if group in categories: # Tabs such as HOTBAR and SEARCH don't hold items
+				categories[group]['items'] = []
+
+	for line in read_lines(source_path, "world/item/Items.java"):
+		match = re.search(rf"public static final Item (\w+) = .+{itemgroupname}\.(\w+).+", line)
+		item = None
+		group = 'MISC'
+		if match:
+			item = match.group(1)
+
+			group = match.group(2).replace('TAB_', '')
+			if group not in items:
+				group = 'MISC'
+		else:
+			match2 = re.search(r"public static final Item (\w+) = .+", line)
+			if match2:
+				item = match2.group(1)
+
+		if item:
+			item = item_substitutions.get(item, item) # Fix any typos present in source code
+
+			if not include_creative and item in creative_only_items:
+				continue
 
-				items[item] = recipes.get(item)
-				categories[group]['items'].append(item)
+			items[item] = recipes.get(item)
+			categories[group]['items'].append(item)
 
 	return dict(items=items, categories=categories)
 
 def main(source_path, mc_version, no_cache=False, include_creative=False, all_recipes=False):
-	cache_path = cache_dir / (mc_version + ("_creative" if include_creative else "") + ("_all-recipes" if all_recipes else "") + ".json")
-
-	if cache_path.exists() and not no_cache:
-		return json.load(open(cache_path, 'r'))
+	cache_path = cache_dir / (mc_version + ("_creative" if include_creative else "") + ("_all-recipes" if all_recipes else "") + cache_format['extension'])
+	manifest = get_manifest(source_path, mc_version)
+
+	# Only reuse the cache if neither the sources nor the parsers have changed since it was written
+	if not no_cache and is_cache_valid(cache_path, manifest):
+		try:
+			data = load_cache(cache_path)
+		except load_errors:
+			data = None
+		if data is not None:
+			count('items cache hits')
+			if not cache_format['native']:
+				data['items'] = {item: from_json(recipe) for item, recipe in data['items'].items()}
+			return data
 
 	data = {}
 	if mc_version >= Version('1.19.3'):
-		data = get_items(source_path, mc_version, include_creative)
+		data = get_items(source_path, mc_version, include_creative, no_cache=no_cache)
 	else:
-		data = get_items_legacy(source_path, mc_version, include_creative)
+		data = get_items_legacy(source_path, mc_version, include_creative, no_cache=no_cache)
 
 	# Cache data
 	os.makedirs(cache_dir, exist_ok=True)
-	with open(cache_path, 'w') as cachefile:
-		json.dump(data, cachefile)
+	dump_cache(data, cache_path)
+	save_manifest(cache_path, manifest)
 
 	return data
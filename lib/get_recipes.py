@@ -9,15 +9,30 @@
 #
 
 import os, re, json
-from pathlib import Path
 
 from .version import Version
 from .get_dye_colors import get_dye_colors
+from .instrument import count, counters
+from .recipe import Recipe
+from .recipe_store import RecipeStore
+from .source_cache import cached_parse
+from .source_reader import read_lines
 
 line_prefix = r"^\s*(?:\(\((?:Shaped|Shapeless)RecipeBuilder\))*"
 one_ingredient_regex = r"(?:\(ItemLike\))?(?:Blocks|Items|ItemTags)\.([\w_]+(?:\.\w+\(\))?)(?:\.asItem\(\))?"
 ingredient_regex = rf"(?:{one_ingredient_regex}|Ingredient\.of\({one_ingredient_regex}(?:, {one_ingredient_regex})*\))"
 
+# Compiled once at import, rather than rebuilt for every line scanned
+requires_regex = re.compile(rf'\.requires\({ingredient_regex}(?:, (?P<count>\d+))?\)')
+define_regex = re.compile(rf"\.define\(Character\.valueOf\('(.)'\), {ingredient_regex}\)")
+pattern_regex = re.compile(r'\.pattern\("([^"]+)"\)')
+cooking_recipe_regex = re.compile(rf'^\s+(?:RecipeProvider|this)\.simpleCookingRecipe\((?:(?:consumer|recipeOutput), )?string, recipeSerializer, n, {one_ingredient_regex}, {one_ingredient_regex}\);')
+waxables_regex = re.compile(rf'^\s+public static final Supplier<BiMap<Block, Block>> WAXABLES = ')
+waxable_pair_regex = re.compile(rf'\.put\(\(Object\){one_ingredient_regex}, \(Object\){one_ingredient_regex}\)')
+block_family_regex = re.compile(rf'^\s+public static final BlockFamily [\w_]+ = BlockFamilies\.familyBuilder\({one_ingredient_regex}\)(.*)\.getFamily\(\);$')
+block_family_variant_regex = re.compile(rf'\.(\w+)\({one_ingredient_regex}(?:, {one_ingredient_regex})?\)')
+smeltables_regex = re.compile(rf'^\s+private static final ImmutableList<ItemLike> (\w+_SMELTABLES) = ImmutableList\.of\(\(Object\)Items\.([\w_]+)(?:, \(Object\)Items\.([\w_]+))*\);')
+
 def format_item_name(name):
 	if type(name) == str:
 		if '.' in name:
@@ -28,22 +43,18 @@ def format_item_name(name):
 		return name
 	return "/".join([format_item_name(n) for n in name if n != None])
 
-# Add a new recipe to the recipes list for the item
+# Add a new recipe to the recipes list for the item, ignoring duplicates; used by the parsers of each source file
+def insert_recipe(recipes, key, new_recipe):
+	return recipes.add(format_item_name(key), new_recipe)
+
+# Add a recipe while merging the parsed recipes, which is the only place recipes are counted
 def add_recipe(recipes, key, new_recipe):
-	key = format_item_name(key)
-	if key in recipes:
-		if type(recipes[key]) == list:
-			if new_recipe in recipes[key]:
-				# print(f'Warning: multiple recipes detected for {key}!')
-				return # Ignore duplicates
-			recipes[key].append(new_recipe)
-		else:
-			if new_recipe == recipes[key]:
-				# print(f'Warning: multiple recipes detected for {key}!')
-				return # Ignore duplicates
-			recipes[key] = [recipes[key], new_recipe]
-	else:
-		recipes[key] = new_recipe
+	if not insert_recipe(recipes, key, new_recipe):
+		# print(f'Warning: multiple recipes detected for {key}!')
+		count('duplicate recipes dropped')
+		return # Ignore duplicates
+
+	count('recipes added')
 
 # Convert a raw recipe pattern from source code into a sensible pattern
 def convert_recipe_pattern(ingredients, raw_pattern):
@@ -500,439 +511,470 @@ def simple_func(func_type, cost, count=1):
 	
 	raise Exception(f'Unhandled type "{func_type}" detected for simple recipe function!')
 
-def process_VanillaRecipe_line(recipes, line, simplest_only, dye_colors, smeltables):
-	# Ignore blasting recipes; all are duplicates of smelting (as of 1.20.2)
-	if 'SimpleCookingRecipeBuilder.blasting(' in line or 'VanillaRecipeProvider.oreBlasting(' in line:
+# Shapeless recipes
+def process_shapeless(recipes, match, line, simplest_only, dye_colors, smeltables):
+	if simplest_only and match.group(1) == 'DRIED_KELP':
 		return
 
-	# Shapeless recipes
-	match = re.match(rf'{line_prefix}(?:ShapelessRecipeBuilder|this)\.shapeless\((?:RecipeCategory\.[\w_]+, )?(?:Blocks|Items)\.([\w_]+(?:\.\w+\(\))?)(?:, (\d+))?\)', line)
-	if match:
-		if simplest_only and match.group(1) == 'DRIED_KELP':
-			return
+	insert_recipe(recipes, match.group(1), {
+		'count': int(match.group(2) or 1),
+		'ingredients': {
+			format_item_name(i.group(1) or i.groups()[1:-1]): int(i.groupdict().get('count') or 1) for i in requires_regex.finditer(line)
+		},
+		'pattern': None
+	})
 
-		add_recipe(recipes, match.group(1), {
-			'count': int(match.group(2) or 1),
-			'ingredients': {
-				format_item_name(i.group(1) or i.groups()[1:-1]): int(i.groupdict().get('count') or 1) for i in re.finditer(rf'\.requires\({ingredient_regex}(?:, (?P<count>\d+))?\)', line)
-			},
-			'pattern': None
-		})
-		return
+# Shaped recipes
+def process_shaped(recipes, match, line, simplest_only, dye_colors, smeltables):
+	item = match.group(1)
+	ingredients = {i.group(1): format_item_name(i.group(2) or i.groups()[2:]) for i in define_regex.finditer(line)}
+	raw_pattern = [list(p.group(1)) for p in pattern_regex.finditer(line)]
 
-	# Shaped recipes
-	match = re.match(rf'{line_prefix}(?:ShapedRecipeBuilder|this)\.shaped\((?:RecipeCategory\.[\w_]+, )?(?:Blocks|Items)\.([\w_]+(?:\.\w+\(\))?)(?:\.unaffected\(\))?(?:, (\d+))?\)', line)
-	if match:
-		item = match.group(1)
-		ingredients = {i.group(1): format_item_name(i.group(2) or i.groups()[2:]) for i in re.finditer(rf"\.define\(Character\.valueOf\('(.)'\), {ingredient_regex}\)", line)}
-		raw_pattern = [list(p.group(1)) for p in re.finditer(r'\.pattern\("([^"]+)"\)', line)]
+	pattern, count = convert_recipe_pattern(ingredients, raw_pattern)
 
-		pattern, count = convert_recipe_pattern(ingredients, raw_pattern)
+	insert_recipe(recipes, item, {
+		'count': int(match.group(2) or 1),
+		'ingredients': count,
+		'pattern': pattern
+	})
 
-		add_recipe(recipes, item, {
-			'count': int(match.group(2) or 1),
-			'ingredients': count,
-			'pattern': pattern
+# Smelting recipes
+def process_smelting(recipes, match, line, simplest_only, dye_colors, smeltables):
+	if match.group(1) == 'SMELTS_TO_GLASS':
+		insert_recipe(recipes, match.group(2), {
+			'count': 1,
+			'ingredients': {
+				'SAND': 1
+			},
+			'pattern': 'furnace'
 		})
-
-		return
-
-	# Smelting recipes
-	match = re.match(rf'{line_prefix}(?:SimpleCookingRecipeBuilder|this)\.smelting\((?:Ingredient\.of|this\.tag)\({one_ingredient_regex}\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}', line)
-	if match:
-		if match.group(1) == 'SMELTS_TO_GLASS':
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					'SAND': 1
-				},
-				'pattern': 'furnace'
-			})
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					'RED_SAND': 1
-				},
-				'pattern': 'furnace'
-			})
-		else:
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					match.group(1): 1
-				},
-				'pattern': 'furnace'
-			})
-		return
-
-	# Ore smelting recipes
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.oreSmelting\((?:(?:consumer|recipeOutput), )?([\w_]+), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}', line)
-	if match:
-		add_recipe(recipes, match.group(2), {
+		insert_recipe(recipes, match.group(2), {
 			'count': 1,
 			'ingredients': {
-				format_item_name(smeltables.get(match.group(1))): 1
+				'RED_SAND': 1
 			},
 			'pattern': 'furnace'
 		})
-		return
-
-	# Stonecutting recipes
-	match = re.match(rf'{line_prefix}(?:SingleItemRecipeBuilder|this)\.stonecutting\(Ingredient\.of\({one_ingredient_regex}\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}(?:, (\d+))?\)', line)
-	if match:
-		add_recipe(recipes, match.group(2), {
-			'count': match.group(3) or 1,
+	else:
+		insert_recipe(recipes, match.group(2), {
+			'count': 1,
 			'ingredients': {
 				match.group(1): 1
 			},
-			'pattern': 'stonecutter'
+			'pattern': 'furnace'
 		})
-		return
 
-	# Netherite smithing recipes
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(?:legacyN|n)etheriteSmithing\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, (?:RecipeCategory\.[\w_]+, )(?:CookingBookCategory\.\w+, )??{one_ingredient_regex}', line)
-	if match:
-		add_recipe(recipes, match.group(2), {
+# Ore smelting recipes
+def process_ore_smelting(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(2), {
+		'count': 1,
+		'ingredients': {
+			format_item_name(smeltables.get(match.group(1))): 1
+		},
+		'pattern': 'furnace'
+	})
+
+# Stonecutting recipes
+def process_stonecutting(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(2), {
+		'count': match.group(3) or 1,
+		'ingredients': {
+			match.group(1): 1
+		},
+		'pattern': 'stonecutter'
+	})
+
+# Netherite smithing recipes
+def process_netherite_smithing(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(2), {
+		'count': 1,
+		'ingredients': {
+			match.group(1): 1,
+			'NETHERITE_INGOT': 1
+		},
+		'pattern': 'smithingTable'
+	})
+
+# Recoloring wool, bed and carpet -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.20.2)
+def add_color_with_dye_recipes(recipes, item, simplest_only, dye_colors):
+	if simplest_only and item != 'WOOL':
+		return # Beds and carpets can be crafted directly with colored wool
+	for color in dye_colors:
+		if simplest_only and item == 'WOOL' and color == 'WHITE':
+			continue # White wool can be crafted directly with string
+		insert_recipe(recipes, f'{color}_{item}', {
 			'count': 1,
 			'ingredients': {
-				match.group(1): 1,
-				'NETHERITE_INGOT': 1
+				item: 1,
+				f'{color}_DYE': 1
 			},
-			'pattern': 'smithingTable'
+			'pattern': None
 		})
-		return
 
-	# Recoloring wool, bed and carpet (1.20.2 to 1.21.11) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.color(?:Block|Item)WithDye\((?:(?:consumer|recipeOutput), )?list, list\d, "(\w+)"(?:, RecipeCategory\.[\w_]+)?\)', line)
-	if match:
-		item = match.group(1).upper()
-		if simplest_only and item != 'WOOL':
-			return # Beds and carpets can be crafted directly with colored wool
-		for color in dye_colors:
-			if simplest_only and item == 'WOOL' and color == 'WHITE':
-				continue # White wool can be crafted directly with string
-			add_recipe(recipes, f'{color}_{item}', {
-				'count': 1,
-				'ingredients': {
-					item: 1,
-					f'{color}_DYE': 1
-				},
-				'pattern': None
-			})
-		return
+# Recoloring wool, bed and carpet (1.20.2 to 1.21.11)
+def process_color_with_dye_legacy(recipes, match, line, simplest_only, dye_colors, smeltables):
+	add_color_with_dye_recipes(recipes, match.group(1).upper(), simplest_only, dye_colors)
 
-	# Recoloring wool, bed and carpet (26.1 and up) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.colorItemWithDye\((?:(?:consumer|recipeOutput), )?dyes, (?:Items.(\w+).asList\(\)|(\w+)s), "(?:\w+)"(?:, RecipeCategory\.[\w_]+)?\)', line)
-	if match:
-		item = match.group(1) or match.group(2).upper()
-		if simplest_only and item != 'WOOL':
-			return # Beds and carpets can be crafted directly with colored wool
-		for color in dye_colors:
-			if simplest_only and item == 'WOOL' and color == 'WHITE':
-				continue # White wool can be crafted directly with string
-			add_recipe(recipes, f'{color}_{item}', {
-				'count': 1,
-				'ingredients': {
-					item: 1,
-					f'{color}_DYE': 1
-				},
-				'pattern': None
-			})
-		return
+# Recoloring wool, bed and carpet (26.1 and up)
+def process_color_with_dye(recipes, match, line, simplest_only, dye_colors, smeltables):
+	add_color_with_dye_recipes(recipes, match.group(1) or match.group(2).upper(), simplest_only, dye_colors)
 
-	# Recoloring Shulker Boxes and Bundles (1.21.2 and up) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.21.2)
-	match = re.match(rf'{line_prefix}TransmuteRecipeBuilder\.transmute\((?:RecipeCategory\.[\w_]+, )?ingredient, (?:Ingredient\.of\(\(ItemLike\)(?:DyeItem\.byColor\(dyeColor\)|dyeItem)\)), (\w+)(Block|Item)', line)
-	if match:
-		ingredient = re.sub(r'([a-z])([A-Z])', r'\1_\2', match.group(1)).upper()
-		for color in dye_colors:
-			add_recipe(recipes, f'{color}_{ingredient}', {
-				'count': 1,
-				'ingredients': {
-					ingredient: 1,
-					f'{color}_DYE': 1
-				},
-				'pattern': None
-			})
-		return
+# Recoloring Shulker Boxes and Bundles (1.21.2 and up) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.21.2)
+def process_transmute(recipes, match, line, simplest_only, dye_colors, smeltables):
+	ingredient = re.sub(r'([a-z])([A-Z])', r'\1_\2', match.group(1)).upper()
+	for color in dye_colors:
+		insert_recipe(recipes, f'{color}_{ingredient}', {
+			'count': 1,
+			'ingredients': {
+				ingredient: 1,
+				f'{color}_DYE': 1
+			},
+			'pattern': None
+		})
 
-	# Recoloring Shulker Boxes (1.21.1 and earlier) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.21.1)
-	match = re.match(rf'{line_prefix}(?:SpecialRecipeBuilder|this)\.special\((RecipeSerializer\.SHULKER_BOX_COLORING|ShulkerBoxColoring::new)\)', line)
-	if match:
-		for color in dye_colors:
-			add_recipe(recipes, f'{color}_SHULKER_BOX', {
+# Recoloring Shulker Boxes (1.21.1 and earlier) -- see net.minecraft.data.recipes.VanillaRecipeProvider (1.21.1)
+def process_shulker_box_coloring(recipes, match, line, simplest_only, dye_colors, smeltables):
+	for color in dye_colors:
+		insert_recipe(recipes, f'{color}_SHULKER_BOX', {
+			'count': 1,
+			'ingredients': {
+				'SHULKER_BOX': 1,
+				f'{color}_DYE': 1
+			},
+			'pattern': None
+		})
+
+# Dyed blocks/items (26.2 and up) -- see net.minecraft.world.level.block.ColorCollection (26.2)
+def process_color_collection(recipes, match, line, simplest_only, dye_colors, smeltables):
+	for color in dye_colors:
+		if match.group(3) in ['dyedShulkerBoxRecipe', 'dyedBundleRecipe']:
+			insert_recipe(recipes, f'{color}_{match.group(2)}', {
 				'count': 1,
 				'ingredients': {
-					'SHULKER_BOX': 1,
-					f'{color}_DYE': 1
+					match.group(2).replace("DYED_", ""): 1,
+					f'{color}_{match.group(1)}': 1
 				},
 				'pattern': None
 			})
-		return
+		else:
+			insert_recipe(recipes, f'{color}_{match.group(1)}', simple_func(match.group(3), f'{color}_{match.group(2)}', 1))
 
-	# Dyed blocks/items (26.2 and up) -- see net.minecraft.world.level.block.ColorCollection (26.2)
-	match = re.match(rf'{line_prefix}ColorCollection\.zipApply\({one_ingredient_regex}, {one_ingredient_regex}, \(x\$0, x\$1\) -> vanillaRecipeProvider\.(\w+)', line)
-	if match:
-		for color in dye_colors:
-			if match.group(3) in ['dyedShulkerBoxRecipe', 'dyedBundleRecipe']:
-				add_recipe(recipes, f'{color}_{match.group(2)}', {
-					'count': 1,
-					'ingredients': {
-						match.group(2).replace("DYED_", ""): 1,
-						f'{color}_{match.group(1)}': 1
-					},
-					'pattern': None
-				})
-			else:
-				add_recipe(recipes, f'{color}_{match.group(1)}', simple_func(match.group(3), f'{color}_{match.group(2)}', 1))
-		return
+# Glazed terracotta (26.2 and up) -- see net.minecraft.data.recipes.VanillaRecipeProvider (26.2)
+def process_glazed_terracotta(recipes, match, line, simplest_only, dye_colors, smeltables):
+	for color in dye_colors:
+		insert_recipe(recipes, f'{color}_{match.group(2)}', {
+			'count': 1,
+			'ingredients': {
+				f'{color}_{match.group(1)}': 1
+			},
+			'pattern': 'furnace'
+		})
 
-	# Glazed terracotta (26.2 and up) -- see net.minecraft.data.recipes.VanillaRecipeProvider (26.2)
-	match = re.match(rf'{line_prefix}DyeColor\.VALUES\.forEach\(dyeColor -> (?:SimpleCookingRecipeBuilder|this)\.smelting\((?:Ingredient\.of|this\.tag)\({one_ingredient_regex}\.pick\(\(DyeColor\)dyeColor\)\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}', line)
-	if match:
-		for color in dye_colors:
-			add_recipe(recipes, f'{color}_{match.group(2)}', {
-				'count': 1,
-				'ingredients': {
-					f'{color}_{match.group(1)}': 1
-				},
-				'pattern': 'furnace'
-			})
-		return
+# Smithing template copying -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
+def process_copy_smithing_template(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(2), {
+		'count': 2,
+		'ingredients': {
+			match.group(2): 1,
+			match.group(3): 1,
+			'DIAMOND': 7,
+		},
+		'pattern': [
+			['DIAMOND', match.group(2), 'DIAMOND'],
+			['DIAMOND', match.group(3), 'DIAMOND'],
+			['DIAMOND', 'DIAMOND', 'DIAMOND'],
+		]
+	})
 
-	# Smithing template copying -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.copySmithingTemplate\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, {ingredient_regex}\);', line)
-	if match:
-		add_recipe(recipes, match.group(2), {
-			'count': 2,
+# One-to-one conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
+def process_one_to_one(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(1), {
+		'count': int(match.groupdict().get('count') or 1),
+		'ingredients': {
+			match.group(2): 1
+		},
+		'pattern': None
+	})
+
+# 2x2/3x3 packer conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
+def process_packer(recipes, match, line, simplest_only, dye_colors, smeltables):
+	if match.group(1) == 'twoByTwo':
+		insert_recipe(recipes, match.group(2), {
+			'count': 1,
 			'ingredients': {
-				match.group(2): 1,
-				match.group(3): 1,
-				'DIAMOND': 7,
+				match.group(3): 4
 			},
 			'pattern': [
-				['DIAMOND', match.group(2), 'DIAMOND'],
-				['DIAMOND', match.group(3), 'DIAMOND'],
-				['DIAMOND', 'DIAMOND', 'DIAMOND'],
+				[match.group(3), match.group(3)],
+				[match.group(3), match.group(3)]
 			]
 		})
-		return
+	else:
+		insert_recipe(recipes, match.group(2), {
+			'count': 1,
+			'ingredients': {
+				match.group(3): 9
+			},
+			'pattern': None
+		})
 
-	# One-to-one conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.oneToOneConversionRecipe\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, {one_ingredient_regex}(?:, "[\w_]+")?(?:, (?P<count>\d+))?', line)
-	if match:
-		add_recipe(recipes, match.group(1), {
-			'count': int(match.groupdict().get('count') or 1),
+# 9x9 packer conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
+def process_nine_block_storage(recipes, match, line, simplest_only, dye_colors, smeltables):
+	is_nugget = match.group(1).endswith("_NUGGET")
+	# 1 block to 9 items
+	if not simplest_only or is_nugget:
+		insert_recipe(recipes, match.group(1), {
+			'count': 9,
 			'ingredients': {
 				match.group(2): 1
 			},
 			'pattern': None
 		})
-		return
-
-	# 2x2/3x3 packer conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(twoByTwo|threeByThree)Packer\((?:(?:consumer|recipeOutput), )?(?:RecipeCategory\.[\w_]+)?, {one_ingredient_regex}, {one_ingredient_regex}(?:, "[\w_]+")?(?:, (\d+))?\);', line)
-	if match:
-		if match.group(1) == 'twoByTwo':
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					match.group(3): 4
-				},
-				'pattern': [
-					[match.group(3), match.group(3)],
-					[match.group(3), match.group(3)]
-				]
-			})
-		else:
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					match.group(3): 9
-				},
-				'pattern': None
-			})
-		return
+	# 9 items to 1 block
+	if not (is_nugget and simplest_only):
+		insert_recipe(recipes, match.group(2), {
+			'count': 1,
+			'ingredients': {
+				match.group(1): 9
+			},
+			'pattern': None
+		})
 
-	# 9x9 packer conversion -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.nineBlockStorageRecipes(?:(?:Recipes)?WithCustom(?:Packing|Unpacking))?\((?:(?:consumer|recipeOutput), )?(?:RecipeCategory\.[\w_]+, )?{one_ingredient_regex}, (?:RecipeCategory\.[\w_]+, )?{one_ingredient_regex}', line)
-	if match:
-		is_nugget = match.group(1).endswith("_NUGGET")
-		# 1 block to 9 items
-		if not simplest_only or is_nugget:
-			add_recipe(recipes, match.group(1), {
-				'count': 9,
-				'ingredients': {
-					match.group(2): 1
-				},
-				'pattern': None
-			})
-		# 9 items to 1 block
-		if not (is_nugget and simplest_only):
-			add_recipe(recipes, match.group(2), {
-				'count': 1,
-				'ingredients': {
-					match.group(1): 9
-				},
-				'pattern': None
-			})
-		return
+# Dried Ghast -- see net.minecraft.data.recipes.RecipeProvider (1.21.6)
+def process_dry_ghast(recipes, match, line, simplest_only, dye_colors, smeltables):
+	insert_recipe(recipes, match.group(1), {
+		'count': 1,
+		'ingredients': {
+			'GHAST_TEAR': 8,
+			'SOUL_SAND': 1
+		},
+		'pattern': [
+			['GHAST_TEAR', 'GHAST_TEAR', 'GHAST_TEAR'],
+			['GHAST_TEAR', 'SOUL_SAND', 'GHAST_TEAR'],
+			['GHAST_TEAR', 'GHAST_TEAR', 'GHAST_TEAR']
+		]
+	})
 
-	# Dried Ghast -- see net.minecraft.data.recipes.RecipeProvider (1.21.6)
-	match = re.match(rf'{line_prefix}this\.dryGhast\({one_ingredient_regex}\)', line)
-	if match:
-		add_recipe(recipes, match.group(1), {
+# Simple recipe functions -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
+def process_simple_func(recipes, match, line, simplest_only, dye_colors, smeltables):
+	match_type = match.group(1)
+
+	if match_type == 'stainedGlassPaneFromGlassPaneAndDye' and simplest_only:
+		return # Only use "stainedGlassPaneFromStainedGlass"
+	if match_type.startswith('planksFromLog'):
+		# Add "recipes" for stripped logs (prior to MC 26.2)
+		insert_recipe(recipes, f"STRIPPED_{match.group(5).replace('LOGS', 'LOG').replace('BLOCKS', 'BLOCK').replace('STEMS', 'STEM')}", {
 			'count': 1,
 			'ingredients': {
-				'GHAST_TEAR': 8,
-				'SOUL_SAND': 1
+				match.group(5): 1
 			},
-			'pattern': [
-				['GHAST_TEAR', 'GHAST_TEAR', 'GHAST_TEAR'],
-				['GHAST_TEAR', 'SOUL_SAND', 'GHAST_TEAR'],
-				['GHAST_TEAR', 'GHAST_TEAR', 'GHAST_TEAR']
-			]
+			'pattern': 'axe'
+		})
+	if match_type in ['dyedShulkerBoxRecipe', 'dyedBundleRecipe']:
+		color = match.group(2).replace("_DYE", "")
+		base_item = match.group(5).replace(color+"_", "")
+		insert_recipe(recipes, match.group(5), {
+			'count': 1,
+			'ingredients': {
+				base_item: 1,
+				match.group(2): 1
+			},
+			'pattern': None
 		})
 		return
 
-	# Simple recipe functions -- see net.minecraft.data.recipes.RecipeProvider (1.20.2)
-	match = re.match(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(\w+)\((?:(?:(?:consumer|recipeOutput), )?)?(?:(?:RecipeCategory\.[\w_]+, )?)?{ingredient_regex}, {ingredient_regex}(?:, (\d+))?', line)
-	if match:
-		match_type = match.group(1)
+	cost = match.group(5) or match.group(6)
+	count = int(match.group(8) or 1)
+
+	insert_recipe(recipes, match.group(2), simple_func(match_type, cost, count))
+
+# Handlers for lines of VanillaRecipeProvider.java, in the order they are tried.  Each handler lists
+# literal strings, at least one of which must appear in a line for its pattern to be able to match;
+# this lets most lines skip most patterns without running them.
+vanilla_recipe_handlers = [
+	(['.shapeless('], re.compile(rf'{line_prefix}(?:ShapelessRecipeBuilder|this)\.shapeless\((?:RecipeCategory\.[\w_]+, )?(?:Blocks|Items)\.([\w_]+(?:\.\w+\(\))?)(?:, (\d+))?\)'), process_shapeless),
+	(['.shaped('], re.compile(rf'{line_prefix}(?:ShapedRecipeBuilder|this)\.shaped\((?:RecipeCategory\.[\w_]+, )?(?:Blocks|Items)\.([\w_]+(?:\.\w+\(\))?)(?:\.unaffected\(\))?(?:, (\d+))?\)'), process_shaped),
+	(['.smelting('], re.compile(rf'{line_prefix}(?:SimpleCookingRecipeBuilder|this)\.smelting\((?:Ingredient\.of|this\.tag)\({one_ingredient_regex}\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}'), process_smelting),
+	(['.oreSmelting('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.oreSmelting\((?:(?:consumer|recipeOutput), )?([\w_]+), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}'), process_ore_smelting),
+	(['.stonecutting('], re.compile(rf'{line_prefix}(?:SingleItemRecipeBuilder|this)\.stonecutting\(Ingredient\.of\({one_ingredient_regex}\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}(?:, (\d+))?\)'), process_stonecutting),
+	(['etheriteSmithing('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(?:legacyN|n)etheriteSmithing\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, (?:RecipeCategory\.[\w_]+, )(?:CookingBookCategory\.\w+, )??{one_ingredient_regex}'), process_netherite_smithing),
+	(['WithDye('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.color(?:Block|Item)WithDye\((?:(?:consumer|recipeOutput), )?list, list\d, "(\w+)"(?:, RecipeCategory\.[\w_]+)?\)'), process_color_with_dye_legacy),
+	(['.colorItemWithDye('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.colorItemWithDye\((?:(?:consumer|recipeOutput), )?dyes, (?:Items.(\w+).asList\(\)|(\w+)s), "(?:\w+)"(?:, RecipeCategory\.[\w_]+)?\)'), process_color_with_dye),
+	(['TransmuteRecipeBuilder.transmute('], re.compile(rf'{line_prefix}TransmuteRecipeBuilder\.transmute\((?:RecipeCategory\.[\w_]+, )?ingredient, (?:Ingredient\.of\(\(ItemLike\)(?:DyeItem\.byColor\(dyeColor\)|dyeItem)\)), (\w+)(Block|Item)'), process_transmute),
+	(['.special('], re.compile(rf'{line_prefix}(?:SpecialRecipeBuilder|this)\.special\((RecipeSerializer\.SHULKER_BOX_COLORING|ShulkerBoxColoring::new)\)'), process_shulker_box_coloring),
+	(['ColorCollection.zipApply('], re.compile(rf'{line_prefix}ColorCollection\.zipApply\({one_ingredient_regex}, {one_ingredient_regex}, \(x\$0, x\$1\) -> vanillaRecipeProvider\.(\w+)'), process_color_collection),
+	(['DyeColor.VALUES.forEach('], re.compile(rf'{line_prefix}DyeColor\.VALUES\.forEach\(dyeColor -> (?:SimpleCookingRecipeBuilder|this)\.smelting\((?:Ingredient\.of|this\.tag)\({one_ingredient_regex}\.pick\(\(DyeColor\)dyeColor\)\), (?:RecipeCategory\.[\w_]+, )?(?:CookingBookCategory\.\w+, )?{one_ingredient_regex}'), process_glazed_terracotta),
+	(['.copySmithingTemplate('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.copySmithingTemplate\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, {ingredient_regex}\);'), process_copy_smithing_template),
+	(['.oneToOneConversionRecipe('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.oneToOneConversionRecipe\((?:(?:consumer|recipeOutput), )?{one_ingredient_regex}, {one_ingredient_regex}(?:, "[\w_]+")?(?:, (?P<count>\d+))?'), process_one_to_one),
+	(['Packer('], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(twoByTwo|threeByThree)Packer\((?:(?:consumer|recipeOutput), )?(?:RecipeCategory\.[\w_]+)?, {one_ingredient_regex}, {one_ingredient_regex}(?:, "[\w_]+")?(?:, (\d+))?\);'), process_packer),
+	(['.nineBlockStorageRecipes'], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.nineBlockStorageRecipes(?:(?:Recipes)?WithCustom(?:Packing|Unpacking))?\((?:(?:consumer|recipeOutput), )?(?:RecipeCategory\.[\w_]+, )?{one_ingredient_regex}, (?:RecipeCategory\.[\w_]+, )?{one_ingredient_regex}'), process_nine_block_storage),
+	(['this.dryGhast('], re.compile(rf'{line_prefix}this\.dryGhast\({one_ingredient_regex}\)'), process_dry_ghast),
+	(['RecipeProvider.', 'this.'], re.compile(rf'{line_prefix}(?:(?:Vanilla)?RecipeProvider|this)\.(\w+)\((?:(?:(?:consumer|recipeOutput), )?)?(?:(?:RecipeCategory\.[\w_]+, )?)?{ingredient_regex}, {ingredient_regex}(?:, (\d+))?'), process_simple_func),
+]
+
+# Counter names for the number of times each handler's regex is tried
+regex_attempt_counters = {handler: f"regex attempts: {handler.__name__}" for _, _, handler in vanilla_recipe_handlers}
+
+# Any line containing none of the handlers' literals cannot be a recipe
+vanilla_recipe_prefilter = re.compile("|".join(re.escape(literal) for literals, _, _ in vanilla_recipe_handlers for literal in literals))
 
-		if match_type == 'stainedGlassPaneFromGlassPaneAndDye' and simplest_only:
-			return # Only use "stainedGlassPaneFromStainedGlass"
-		if match_type.startswith('planksFromLog'):
-			# Add "recipes" for stripped logs (prior to MC 26.2)
-			add_recipe(recipes, f"STRIPPED_{match.group(5).replace('LOGS', 'LOG').replace('BLOCKS', 'BLOCK').replace('STEMS', 'STEM')}", {
-				'count': 1,
-				'ingredients': {
-					match.group(5): 1
-				},
-				'pattern': 'axe'
-			})
-		if match_type in ['dyedShulkerBoxRecipe', 'dyedBundleRecipe']:
-			color = match.group(2).replace("_DYE", "")
-			base_item = match.group(5).replace(color+"_", "")
-			add_recipe(recipes, match.group(5), {
+def process_VanillaRecipe_line(recipes, line, simplest_only, dye_colors, smeltables):
+	if not vanilla_recipe_prefilter.search(line):
+		return
+
+	# Ignore blasting recipes; all are duplicates of smelting (as of 1.20.2)
+	if 'SimpleCookingRecipeBuilder.blasting(' in line or 'VanillaRecipeProvider.oreBlasting(' in line:
+		return
+
+	for literals, regex, handler in vanilla_recipe_handlers:
+		if not any(literal in line for literal in literals):
+			continue
+		counters[regex_attempt_counters[handler]] += 1
+		match = regex.match(line)
+		if match:
+			handler(recipes, match, line, simplest_only, dye_colors, smeltables)
+			return
+
+# Get recipes for cooked food
+def get_cooking_recipes(source_path):
+	recipes = RecipeStore()
+
+	for line in read_lines(source_path, "data/recipes/RecipeProvider.java"):
+		match = cooking_recipe_regex.match(line)
+		if match:
+			insert_recipe(recipes, match.group(2), {
 				'count': 1,
 				'ingredients': {
-					base_item: 1,
-					match.group(2): 1
+					match.group(1): 1
 				},
-				'pattern': None
+				'pattern': 'furnace'
 			})
-			return
-
-		cost = match.group(5) or match.group(6)
-		count = int(match.group(8) or 1)
+			continue
 
-		add_recipe(recipes, match.group(2), simple_func(match_type, cost, count))
-		return
-
-# Get item recipes
-def get_recipes(source_path, mc_version, simplest_only=True):
-	recipes = {}
-	smeltables = {}
+	return recipes.to_dict()
 
-	dye_colors = get_dye_colors(source_path)
+# Get recipes for waxable items
+def get_waxable_recipes(source_path):
+	recipes = RecipeStore()
 
-	# Get recipes for cooked food
-	with open(Path(f"{source_path}/data/recipes/RecipeProvider.java")) as dcj:
-		for line in dcj.readlines():
-			match = re.match(rf'^\s+(?:RecipeProvider|this)\.simpleCookingRecipe\((?:(?:consumer|recipeOutput), )?string, recipeSerializer, n, {one_ingredient_regex}, {one_ingredient_regex}\);', line)
-			if match:
-				add_recipe(recipes, match.group(2), {
+	for line in read_lines(source_path, "world/item/HoneycombItem.java"):
+		match = waxables_regex.match(line)
+		if match:
+			pairs = waxable_pair_regex.finditer(line)
+			for pair in pairs:
+				insert_recipe(recipes, pair.group(2), {
 					'count': 1,
 					'ingredients': {
-						match.group(1): 1
+						pair.group(1): 1,
+						'HONEYCOMB': 1
 					},
-					'pattern': 'furnace'
+					'pattern': None
 				})
-				continue
-
-	if mc_version >= Version("1.17"):
-		# Get recipes for waxable items
-		with open(Path(f"{source_path}/world/item/HoneycombItem.java")) as dcj:
-			for line in dcj.readlines():
-				match = re.match(rf'^\s+public static final Supplier<BiMap<Block, Block>> WAXABLES = ', line)
-				if match:
-					pairs = re.finditer(rf'\.put\(\(Object\){one_ingredient_regex}, \(Object\){one_ingredient_regex}\)', line)
-					for pair in pairs:
-						add_recipe(recipes, pair.group(2), {
+			continue
+
+	return recipes.to_dict()
+
+# Get recipes for block families (stairs, fences, etc.)
+def get_block_family_recipes(source_path, mc_version):
+	recipes = RecipeStore()
+
+	for line in read_lines(source_path, "data/BlockFamilies.java"):
+		match = block_family_regex.match(line)
+		if match:
+			sets = block_family_variant_regex.finditer(match.group(2))
+			for s in sets:
+				variant = s.group(1)
+				if variant in ['mosaic', 'log']:
+					# Bamboo Mosaic recipe is defined elsewhere
+					# Since MC 26.2, logs are added as a variant to the block family
+					continue
+				if variant == 'cobbled':
+					# Before MC 26.2, cobbled block smelting recipes were separately defined
+					if mc_version >= Version("26.2"):
+						insert_recipe(recipes, match.group(1), {
 							'count': 1,
 							'ingredients': {
-								pair.group(1): 1,
-								'HONEYCOMB': 1
+								s.group(2): 1
 							},
-							'pattern': None
+							'pattern': 'furnace'
 						})
 					continue
+				insert_recipe(recipes, s.group(2), create_variant_recipe(variant, match.group(1)))
 
-		# Get recipes for block families (stairs, fences, etc.)
-		with open(Path(f"{source_path}/data/BlockFamilies.java")) as bfj:
-			for line in bfj.readlines():
-				match = re.match(rf'^\s+public static final BlockFamily [\w_]+ = BlockFamilies\.familyBuilder\({one_ingredient_regex}\)(.*)\.getFamily\(\);$', line)
-				if match:
-					sets = re.finditer(rf'\.(\w+)\({one_ingredient_regex}(?:, {one_ingredient_regex})?\)', match.group(2))
-					for s in sets:
-						variant = s.group(1)
-						if variant in ['mosaic', 'log']:
-							# Bamboo Mosaic recipe is defined elsewhere
-							# Since MC 26.2, logs are added as a variant to the block family
-							continue
-						if variant == 'cobbled':
-							# Before MC 26.2, cobbled block smelting recipes were separately defined
-							if mc_version >= Version("26.2"):
-								add_recipe(recipes, match.group(1), {
-									'count': 1,
-									'ingredients': {
-										s.group(2): 1
-									},
-									'pattern': 'furnace'
-								})
-							continue
-						add_recipe(recipes, s.group(2), create_variant_recipe(variant, match.group(1)))
+	return recipes.to_dict()
 
+def get_vanilla_recipes_file(mc_version):
 	if mc_version >= Version("1.19.3"):
-		recipes_path = Path(f"{source_path}/data/recipes/packs/VanillaRecipeProvider.java")
-	else:
-		recipes_path = Path(f"{source_path}/data/recipes/RecipeProvider.java")
+		return "data/recipes/packs/VanillaRecipeProvider.java"
+	return "data/recipes/RecipeProvider.java"
 
-	with open(recipes_path) as vrpj:
-		for line in vrpj.readlines():
-			# Get smeltables lists
-			match = re.match(rf'^\s+private static final ImmutableList<ItemLike> (\w+_SMELTABLES) = ImmutableList\.of\(\(Object\)Items\.([\w_]+)(?:, \(Object\)Items\.([\w_]+))*\);', line)
-			if match:
-				smeltables[match.group(1)] = match.groups()[1:]
-				continue
+# Get recipes defined by the main recipe provider
+def get_vanilla_recipes(source_path, mc_version, simplest_only, dye_colors):
+	recipes = RecipeStore()
+	smeltables = {}
 
-			# Process recipe lines
-			process_VanillaRecipe_line(recipes, line, simplest_only, dye_colors, smeltables)
+	for line in read_lines(source_path, get_vanilla_recipes_file(mc_version)):
+		# Get smeltables lists
+		match = smeltables_regex.match(line)
+		if match:
+			smeltables[match.group(1)] = match.groups()[1:]
+			continue
+
+		# Process recipe lines
+		process_VanillaRecipe_line(recipes, line, simplest_only, dye_colors, smeltables)
+
+	return recipes.to_dict()
+
+# Get item recipes, as a Recipe (or a list of them, for items with several recipes) for each item
+def get_recipes(source_path, mc_version, simplest_only=True, no_cache=False):
+	recipes = RecipeStore()
+
+	dye_colors = get_dye_colors(source_path)
+
+	# Each source file is parsed (or loaded from cache) on its own, then merged in the order they were always read
+	parts = [
+		cached_parse("recipes_cooking", source_path, mc_version, ["data/recipes/RecipeProvider.java"], lambda: get_cooking_recipes(source_path), no_cache=no_cache)
+	]
+
+	if mc_version >= Version("1.17"):
+		parts += [
+			cached_parse("recipes_waxables", source_path, mc_version, ["world/item/HoneycombItem.java"], lambda: get_waxable_recipes(source_path), no_cache=no_cache),
+			cached_parse("recipes_block-families", source_path, mc_version, ["data/BlockFamilies.java"], lambda: get_block_family_recipes(source_path, mc_version), no_cache=no_cache)
+		]
+
+	parts.append(
+		cached_parse("recipes_vanilla" + ("" if simplest_only else "_all-recipes"), source_path, mc_version, [get_vanilla_recipes_file(mc_version), "world/item/DyeColor.java"], lambda: get_vanilla_recipes(source_path, mc_version, simplest_only, dye_colors), no_cache=no_cache)
+	)
+
+	for part in parts:
+		for key, value in part.items():
+			for recipe in (value if type(value) == list else [value]):
+				add_recipe(recipes, key, Recipe.from_dict(recipe))
 
 	# Add "recipes" for concrete
 	for color in dye_colors:
-		add_recipe(recipes, f'{color}_CONCRETE', {
+		add_recipe(recipes, f'{color}_CONCRETE', Recipe.from_dict({
 			'count': 1,
 			'ingredients': {
 				f'{color}_CONCRETE_POWDER': 1
 			},
 			'pattern': 'submerge'
-		})
+		}))
 
 	# Add "recipe" for dirt path and farmland
-	add_recipe(recipes, 'DIRT_PATH', {
+	add_recipe(recipes, 'DIRT_PATH', Recipe.from_dict({
 		'count': 1,
 		'ingredients': {
 			'DIRT': 1
 		},
 		'pattern': 'shovel'
-	})
-	add_recipe(recipes, 'FARMLAND', {
+	}))
+	add_recipe(recipes, 'FARMLAND', Recipe.from_dict({
 		'count': 1,
 		'ingredients': {
 			'DIRT': 1
 		},
 		'pattern': 'hoe'
-	})
+	}))
 
-	return recipes
+	return recipes.to_dict()
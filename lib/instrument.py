@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/instrument
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Time the stages of a run, count what each stage did, and write the results as a JSON run report
+#
+
+import os, sys, json, time, cProfile
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Counters are plain increments on this, so they can be left in hot loops
+counters = Counter()
+
+def new_stage(name):
+	return {'name': name, 'time': 0.0, 'calls': 0, 'children': {}}
+
+root_stage = new_stage('run')
+stage_stack = [root_stage]
+
+def reset():
+	global root_stage
+	counters.clear()
+	root_stage = new_stage('run')
+	stage_stack[:] = [root_stage]
+
+# Time a stage of the run; stages nest, and a stage entered several times within the same parent is added up
+@contextmanager
+def stage(name):
+	parent = stage_stack[-1]
+	node = parent['children'].setdefault(name, new_stage(name))
+	stage_stack.append(node)
+
+	start = time.perf_counter()
+	try:
+		yield node
+	finally:
+		node['time'] += time.perf_counter() - start
+		node['calls'] += 1
+		stage_stack.pop()
+
+# Add time spent outside the stage stack, such as in a worker thread, as a stage of the current stage
+def add_stage_time(name, seconds):
+	node = stage_stack[-1]['children'].setdefault(name, new_stage(name))
+	node['time'] += seconds
+	node['calls'] += 1
+
+def count(name, amount=1):
+	counters[name] += amount
+
+def format_stage(node):
+	return {
+		'name': node['name'],
+		'time': round(node['time'], 6),
+		'calls': node['calls'],
+		'children': [format_stage(child) for child in node['children'].values()]
+	}
+
+def get_report():
+	return {
+		'command': sys.argv,
+		'finished': datetime.now(timezone.utc).isoformat(),
+		'stages': [format_stage(child) for child in root_stage['children'].values()],
+		'counters': dict(sorted(counters.items()))
+	}
+
+def write_report(path):
+	os.makedirs(Path(path).parent, exist_ok=True)
+	with open(path, 'w') as f:
+		json.dump(get_report(), f, indent=2)
+
+# Instrument a whole run, optionally profiling it with cProfile and writing a run report at the end
+@contextmanager
+def instrument_run(name, profile_path=None, report_path=None):
+	reset()
+	profiler = cProfile.Profile() if profile_path else None
+
+	try:
+		if profiler:
+			profiler.enable()
+		with stage(name):
+			yield
+	finally:
+		if profiler:
+			profiler.disable()
+			os.makedirs(Path(profile_path).parent, exist_ok=True)
+			profiler.dump_stats(profile_path)
+			print(f"Profile written to {profile_path} (view it with python3 -m pstats {profile_path})")
+		if report_path:
+			write_report(report_path)
+			print(f"Run report written to {report_path}")
+
+# Add the --profile and --report options to a script's arguments
+def add_arguments(parser, output_dir):
+	parser.add_argument('--profile', nargs='?', type=Path, const=output_dir / "profile.pstats", help="Profile the run with cProfile, writing pstats output to the given file (default: output/profile.pstats)")
+	parser.add_argument('--report', nargs='?', type=Path, const=output_dir / "report.json", help="Write a JSON report of stage timings and counters to the given file (default: output/report.json)")
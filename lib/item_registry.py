@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/item_registry
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Give every item name a dense integer id, along with the other names it goes by, so prices can be kept in arrays
+#
+
+import sys, threading
+from array import array
+
+class ItemRegistry:
+	def __init__(self):
+		# Held while registering, so threads sharing the registry (such as the server's) never get clashing ids
+		self.lock = threading.Lock()
+		self.clear()
+
+	# Forget every item; any ids handed out before are no longer valid
+	def clear(self):
+		self.ids = {}
+		self.names = []
+		self.essentials_names = {}
+
+	def __len__(self):
+		return len(self.names)
+
+	# Get the id of an item, registering it if it hasn't been seen before
+	def get_id(self, name):
+		item_id = self.ids.get(name)
+		if item_id is None:
+			with self.lock:
+				item_id = self.ids.get(name)
+				if item_id is None:
+					name = sys.intern(name)
+					self.essentials_names[name] = name.replace('_', '').lower()
+					self.names.append(name)
+					item_id = self.ids[name] = len(self.names) - 1
+		return item_id
+
+	def register_all(self, names):
+		ids = self.ids
+		for name in names:
+			if name not in ids:
+				self.get_id(name)
+
+	# The name EssentialsX (and so worth.yml and the shops) uses for an item
+	def get_essentials_name(self, name):
+		if name not in self.ids:
+			self.get_id(name)
+		return self.essentials_names[name]
+
+	# An array with a value for every item registered so far, indexed by id
+	def new_values(self):
+		return array('d', bytes(8 * len(self.names)))
+
+# Shared by everything that prices or exports items, so names are only registered once
+registry = ItemRegistry()
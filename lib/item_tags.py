@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/item_tags
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Resolve the item tags and aliases used as recipe ingredients to the items they are priced as
+#
+
+import re
+from types import MappingProxyType
+
+from .instrument import count
+from .source_cache import cached_parse
+from .source_reader import read_lines
+
+item_tag_regex = re.compile(r'^\s+public static final [\w.<>]+ (\w+) = ')
+
+# Tags whose representative can't be worked out from their name
+tag_representatives = {
+	'PLANKS': 'OAK_PLANKS',
+	'LOGS': 'OAK_LOG',
+	'LOGS_THAT_BURN': 'OAK_LOG',
+	'WOODEN_SLABS': 'OAK_SLAB',
+	'COALS': 'COAL',
+	'WOOL': 'WHITE_WOOL',
+	'SOUL_FIRE_BASE_BLOCKS': 'SOUL_SOIL',
+	'STONE_CRAFTING_MATERIALS': 'COBBLESTONE',
+	'CHISELED_QUARTZ_BLOCK/QUARTZ_PILLAR': 'QUARTZ_PILLAR',
+	'FURNACE_MATERIALS': 'COBBLESTONE',
+	'WOODEN_FENCES': 'OAK_FENCE',
+	'WOODEN_TOOL_MATERIALS': 'OAK_PLANKS',
+	'STONE_TOOL_MATERIALS': 'COBBLESTONE',
+	'IRON_TOOL_MATERIALS': 'IRON_INGOT',
+	'GOLD_TOOL_MATERIALS': 'GOLD_INGOT',
+	'DIAMOND_TOOL_MATERIALS': 'DIAMOND',
+	'EGGS': 'EGG',
+	'LEAVES': 'OAK_LEAVES',
+	'COPPER_TOOL_MATERIALS': 'COPPER_INGOT',
+	'CHAIN': 'IRON_CHAIN'
+}
+
+# Get the names of the item tags declared in ItemTags.java
+def get_item_tags(source_path):
+	tags = []
+
+	for line in read_lines(source_path, "tags/ItemTags.java"):
+		match = item_tag_regex.match(line)
+		if match:
+			tags.append(match.group(1))
+
+	return tags
+
+# Resolve an ingredient to the item it is priced as, from its name alone
+def resolve_ingredient(item_id):
+	if item_id in tag_representatives:
+		return tag_representatives[item_id]
+
+	if '/' in item_id:
+		item_id = item_id.split('/')[0]
+	elif item_id.endswith('_LOGS'):
+		item_id = item_id.replace('_LOGS', '_LOG')
+	elif item_id.endswith('_STEMS'):
+		item_id = item_id.replace('_STEMS', '_STEM')
+	elif item_id.endswith('_BLOCKS'):
+		item_id = item_id.replace('_BLOCKS', '_BLOCK')
+
+	return item_id
+
+# Guess a representative for a tag that doesn't resolve to an item from its name, such as WOODEN_DOORS or CANDLES
+def derive_representative(tag, is_item):
+	singulars = [tag[:-2], tag[:-1]] if tag.endswith('ES') else [tag[:-1]] if tag.endswith('S') else []
+	for singular in singulars:
+		for candidate in [singular, singular.replace('WOODEN_', 'OAK_'), 'OAK_' + singular, 'WHITE_' + singular]:
+			if is_item(candidate):
+				return candidate
+	return None
+
+# A frozen lookup table from ingredient names, item tags included, to the items they are priced as
+class RemapTable:
+	__slots__ = ('table', 'unresolved')
+
+	def __init__(self, table, unresolved):
+		self.table = MappingProxyType(table)
+		self.unresolved = tuple(unresolved)
+
+	# Remap an ingredient; names that weren't known when the table was built are resolved from their name
+	def __call__(self, item_id):
+		remapped = self.table.get(item_id)
+		return remapped if remapped is not None else resolve_ingredient(item_id)
+
+	def __len__(self):
+		return len(self.table)
+
+# Build the remapping table for a version's tags and the ingredients of its items' recipes
+def build_remap_table(tags, items):
+	is_item = lambda name: name in items
+
+	ingredients = set()
+	for recipes in items.values():
+		for recipe in (recipes if type(recipes) == list else [recipes] if recipes else []):
+			ingredients.update(i for i, ic in recipe.ingredients if i is not None)
+
+	tags = set(tags)
+	table = {}
+	unresolved = []
+	for name in sorted(ingredients | tags):
+		remapped = resolve_ingredient(name)
+		if name in tags and not is_item(remapped):
+			remapped = derive_representative(name, is_item) or remapped
+			if not is_item(remapped) and name in ingredients:
+				unresolved.append(name)
+		table[name] = remapped
+
+	return RemapTable(table, unresolved)
+
+remap_tables = {}
+
+# Get the remapping table for a version, which is only built once per version
+def get_remap_table(source_path, mc_version, items, no_cache=False):
+	key = str(mc_version)
+	if key not in remap_tables or no_cache:
+		tags = cached_parse("item_tags", source_path, mc_version, ["tags/ItemTags.java"], lambda: get_item_tags(source_path), no_cache=no_cache)
+		remap_tables[key] = build_remap_table(tags, items)
+
+		table = remap_tables[key]
+		count('unresolved tags', len(table.unresolved))
+		if table.unresolved:
+			print(f"Warning: {len(table.unresolved)} item tag(s) used in recipes don't match any item, so those recipes can't be priced: {', '.join(table.unresolved)}")
+
+	return remap_tables[key]
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/output
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Write output files atomically, leaving files whose contents haven't changed untouched
+#
+
+import hashlib, json, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from .recipe import to_json
+
+# Get the SHA-256 of a file's contents, or None if it doesn't exist
+def file_digest(path):
+	try:
+		with open(path, 'rb') as f:
+			return hashlib.file_digest(f, 'sha256').hexdigest()
+	except FileNotFoundError:
+		return None
+
+# Write a file by streaming into a temporary file next to it with write(file), then renaming it into place,
+# so readers only ever see the old or the new file; returns False if the file already had the same contents
+def write_atomic(path, write, mode='w', compare=True):
+	os.makedirs(path.parent, exist_ok=True)
+	temp_path = path.with_name(path.name + f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+	try:
+		with open(temp_path, mode) as f:
+			write(f)
+
+		if compare and file_digest(temp_path) == file_digest(path):
+			os.remove(temp_path)
+			return False
+
+		os.replace(temp_path, path)
+		return True
+	except BaseException:
+		if temp_path.exists():
+			os.remove(temp_path)
+		raise
+
+# Write several files at once across a pool of threads, with write(file, data) for each file's data;
+# returns whether each file changed and how long it took, keyed by file name
+def write_all_atomic(outpath, files, write, workers=None):
+	def write_file(filename, data):
+		start = time.perf_counter()
+		changed = write_atomic(outpath / filename, lambda f: write(f, data))
+		return changed, time.perf_counter() - start
+
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		futures = {filename: executor.submit(write_file, filename, data) for filename, data in files.items()}
+		return {filename: future.result() for filename, future in futures.items()}
+
+# The digest of a generated file is recorded next to it, so whether it needs rewriting can be told without reading it
+def get_digest_path(path):
+	return path.with_name(path.name + ".digest.json")
+
+def get_delta_path(path):
+	return path.with_name(path.stem + ".delta.json")
+
+def get_index_path(path):
+	return path.with_name(path.name + ".index.json")
+
+def read_digest(path):
+	try:
+		with open(get_digest_path(path), 'r') as f:
+			return json.load(f)
+	except (FileNotFoundError, ValueError):
+		return None
+
+# Whether a file is still the one its digest was recorded for, going by its size and modification time
+def matches_record(path, record):
+	try:
+		stat = os.stat(path)
+	except FileNotFoundError:
+		return False
+	return record is not None and (stat.st_size, stat.st_mtime_ns) == (record['size'], record['mtime_ns'])
+
+# The digest of a file as it is now, from its digest record if it hasn't been touched since, or else by hashing it
+def current_digest(path):
+	record = read_digest(path)
+	return record['sha256'] if matches_record(path, record) else file_digest(path)
+
+# The entries a generated file was made from, as indexed next to it, or None if the file was changed since
+def read_index(path):
+	path = Path(path)
+	try:
+		with open(get_index_path(path), 'r') as f:
+			index = json.load(f)
+	except (FileNotFoundError, ValueError):
+		return None
+
+	if index.get('sha256') != current_digest(path):
+		return None
+	return index['entries']
+
+def write_index(path, digest, entries):
+	write_atomic(get_index_path(path), lambda f: json.dump({'sha256': digest, 'entries': entries}, f, default=to_json), compare=False)
+
+# Short digests of each entry of a generated file, to tell which entries changed between generations
+def hash_entries(entries):
+	return {key: hashlib.sha256(json.dumps(value, sort_keys=True, default=to_json).encode()).hexdigest()[:16] for key, value in entries.items()}
+
+def get_delta(old_entries, new_entries):
+	return {
+		'added': [key for key in new_entries if key not in old_entries],
+		'changed': [key for key, value in new_entries.items() if key in old_entries and old_entries[key] != value],
+		'removed': [key for key in old_entries if key not in new_entries]
+	}
+
+# Write a generated file atomically if its contents changed, recording its digest, and digests of the entries it
+# was made from, next to it. With delta, the keys that changed since the last generation are written to a delta
+# file alongside it. With index, the entries are also written as JSON, to be loaded with read_index instead of
+# parsing the file; returns the digest of the contents, and whether the file was written
+def write_output(path, contents, entries=None, delta=False, index=False):
+	path = Path(path)
+	data = contents.encode()
+	digest = hashlib.sha256(data).hexdigest()
+	record = read_digest(path)
+
+	if matches_record(path, record):
+		# The file is as it was generated, so its digest says whether anything changed
+		changed = record['sha256'] != digest
+		if changed:
+			write_atomic(path, lambda f: f.write(data), 'wb', compare=False)
+	else:
+		# The file is missing or was edited by hand since, so compare it with the new contents
+		changed = write_atomic(path, lambda f: f.write(data), 'wb')
+
+	if index and entries is not None and (changed or read_index(path) is None):
+		write_index(path, digest, entries)
+
+	if not changed and matches_record(path, record) and (entries is None or 'entries' in record):
+		return digest, False
+
+	stat = os.stat(path)
+	new_record = {'sha256': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+	if entries is not None:
+		# Entries are recorded even without delta, so the first delta asked for after such runs is still right
+		new_record['entries'] = new_entries = hash_entries(entries)
+		if delta and changed:
+			if record is None:
+				delta_data = {'previous': None, 'sha256': digest, **get_delta({}, new_entries)}
+			elif 'entries' not in record:
+				# Recorded by an older version of the toolkit, so what changed can't be told
+				delta_data = {'previous': record['sha256'], 'sha256': digest, 'unknown': True, 'added': None, 'changed': None, 'removed': None}
+			else:
+				delta_data = {'previous': record['sha256'], 'sha256': digest, **get_delta(record['entries'], new_entries)}
+			write_atomic(get_delta_path(path), lambda f: json.dump(delta_data, f, indent=2), compare=False)
+
+	write_atomic(get_digest_path(path), lambda f: json.dump(new_record, f), compare=False)
+	return digest, changed
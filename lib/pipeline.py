@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/pipeline
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Keep what each stage works out for a version, so later stages in the same process reuse it instead of redoing it
+#
+
+from pathlib import Path
+
+from .get_items import main as get_items
+from .item_tags import remap_tables
+from .output import read_digest, matches_record
+from .prepare_source import main as prepare_source
+
+class PipelineContext:
+	def __init__(self, mc_version):
+		self.mc_version = mc_version
+		self.source_path = None
+		self.items = {}
+		self.worth_files = {}
+
+	def get_source_path(self):
+		if self.source_path is None:
+			self.source_path = prepare_source(self.mc_version)
+		return self.source_path
+
+	# Items are kept for each combination of flags; with no_cache they're parsed again, unless they already were
+	# with no_cache in this process
+	def get_items(self, no_cache=False, include_creative=False, all_recipes=False):
+		key = (include_creative, all_recipes)
+		if key not in self.items or (no_cache and not self.items[key][1]):
+			self.items[key] = (get_items(self.get_source_path(), self.mc_version, no_cache, include_creative, all_recipes), no_cache)
+		return self.items[key][0]
+
+	# Remember the entries written to a worth.yml, so shops can be made from them without reading it back
+	def set_worth_file(self, path, digest, entries):
+		self.worth_files[Path(path).resolve()] = (digest, entries)
+
+	# The entries of a worth.yml written earlier in this process, or None if it was changed since
+	def get_worth_file(self, path):
+		path = Path(path).resolve()
+		if path not in self.worth_files:
+			return None
+
+		digest, entries = self.worth_files[path]
+		record = read_digest(path)
+		if not matches_record(path, record) or record['sha256'] != digest:
+			return None
+		return entries
+
+contexts = {}
+
+def get_context(mc_version):
+	key = str(mc_version)
+	if key not in contexts:
+		contexts[key] = PipelineContext(mc_version)
+	return contexts[key]
+
+# Forget everything kept for a version, such as once a run has finished with it
+def release_context(mc_version):
+	contexts.pop(str(mc_version), None)
+	remap_tables.pop(str(mc_version), None)
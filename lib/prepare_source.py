@@ -9,33 +9,250 @@
 #
 
 import os
+import re
+import shutil
+import subprocess
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 
+from .source_files import get_source_files
+from .source_snapshot import SourceSnapshot, create_snapshot, has_snapshot
 from .version import Version
 
+try:
+	import fcntl
+except ImportError:
+	fcntl = None
+	import msvcrt
+
 sys.path.insert(0, Path(__file__).parent.parent)
 
+import DecompilerMC.main as decompiler
 from DecompilerMC.main import run as do_decompile
 
-def main(mc_version, silent=False):
-	decompiler_path = Path(os.path.dirname(__file__)) / ".." / "DecompilerMC"
-	source_path = decompiler_path / "src" / str(mc_version) / "client" / "net" / "minecraft"
+decompiler_path = Path(os.path.dirname(__file__)) / ".." / "DecompilerMC"
+lock_dir = decompiler_path / "src" / ".locks"
+
+# Only decompile the classes listed in source_files, rather than the whole client
+minimal_sources = os.environ.get('MC_TOOLKIT_MINIMAL_SOURCES', '') not in ['', '0']
+minimal_marker = ".minimal"
+
+# Extract the needed files into a source snapshot and delete the decompiled tree
+source_snapshots = os.environ.get('MC_TOOLKIT_SOURCE_SNAPSHOTS', '') not in ['', '0']
+
+# Approximate memory used by a single decompilation (DecompilerMC runs Java with -Xmx4G)
+decompile_memory = 4 * 1024 ** 3
+
+# Hold an exclusive lock on a version's sources, so that concurrent runs don't decompile into the same tree
+@contextmanager
+def version_lock(mc_version):
+	os.makedirs(lock_dir, exist_ok=True)
+
+	with open(lock_dir / f"{mc_version}.lock", 'a+') as lockfile:
+		if fcntl:
+			fcntl.flock(lockfile, fcntl.LOCK_EX)
+		else:
+			while True:
+				try:
+					msvcrt.locking(lockfile.fileno(), msvcrt.LK_LOCK, 1)
+					break
+				except OSError:
+					continue # LK_LOCK gives up after 10 seconds, keep waiting
+
+		try:
+			yield
+		finally:
+			if fcntl:
+				fcntl.flock(lockfile, fcntl.LOCK_UN)
+			else:
+				lockfile.seek(0)
+				msvcrt.locking(lockfile.fileno(), msvcrt.LK_UNLCK, 1)
+
+def get_source_path(mc_version):
+	return decompiler_path / "src" / str(mc_version) / "client" / "net" / "minecraft"
+
+# Regex matching the classes the toolkit reads (and their inner classes), for CFR's --jarfilter
+def get_class_filter(mc_version):
+	classes = ["net.minecraft." + f.removesuffix(".java").replace("/", ".") for f in get_source_files(mc_version)]
+	return r"^(" + "|".join(re.escape(c) for c in classes) + r")(\$.*)?$"
+
+def is_minimal_tree(mc_version):
+	return (get_source_path(mc_version).parent.parent / minimal_marker).exists()
+
+# Check whether a minimal tree was made with the current list of source files
+def is_minimal_tree_current(mc_version):
+	marker = get_source_path(mc_version).parent.parent / minimal_marker
+	if not marker.exists():
+		return True # A full tree, which contains everything
+
+	with open(marker, 'r') as f:
+		return f.read().splitlines() == get_source_files(mc_version)
+
+def mark_minimal_tree(mc_version):
+	with open(get_source_path(mc_version).parent.parent / minimal_marker, 'w') as f:
+		f.write("\n".join(get_source_files(mc_version)) + "\n")
+
+# Delete every decompiled file that the toolkit doesn't read
+def prune_sources(mc_version):
+	source_path = get_source_path(mc_version)
+	needed = {source_path / f for f in get_source_files(mc_version)}
+
+	for root, dirs, files in os.walk(source_path.parent.parent, topdown=False):
+		for f in files:
+			path = Path(root) / f
+			if path not in needed and f != minimal_marker:
+				path.unlink()
+		if not os.listdir(root):
+			os.rmdir(root)
+
+	mark_minimal_tree(mc_version)
+
+# DecompilerMC's remap step writes the remapped jar to src/<version>-<side>-temp.jar
+def get_remapped_jar(mc_version, side):
+	path = decompiler_path / "src" / f"{mc_version}-{side}-temp.jar"
+	if not path.exists():
+		raise Exception(f"Could not find the remapped {side} jar for {mc_version} at {path}")
+	return path
+
+# Remap the client using DecompilerMC's individual steps, then decompile only the needed classes with CFR
+def decompile_minimal(mc_version, keep_downloads=False):
+	version = str(mc_version)
+
+	decompiler.get_version_manifest(version, True)
+	decompiler.get_mappings(version, "client", True)
+	decompiler.convert_mappings(version, "client", True)
+	decompiler.get_version_jar(version, "client", True)
+	decompiler.remap(version, "client", True)
+
+	cfr_jar = max((decompiler_path / "lib").glob("cfr*.jar"))
+	output_path = get_source_path(mc_version).parent.parent
+	subprocess.run([
+		"java", "-Xmx2G", "-jar", str(cfr_jar), str(get_remapped_jar(mc_version, "client")),
+		"--outputdir", str(output_path),
+		"--jarfilter", get_class_filter(mc_version),
+		"--caseinsensitivefs", "true",
+		"--silent", "true",
+	], check=True)
+
+	if not keep_downloads:
+		decompiler.delete_dependencies(version, "client", True)
+
+	mark_minimal_tree(mc_version)
+
+def main(mc_version, silent=False, keep_downloads=False, minimal=None, snapshot=None):
+	source_path = get_source_path(mc_version)
+	minimal = minimal_sources if minimal is None else minimal
+	snapshot = source_snapshots if snapshot is None else snapshot
 
 	if mc_version <= Version("1.14.3"):
 		raise Exception("DecompilerMC cannot decompile Minecraft 1.14.3 or lower, as no source mappings are provided")
 
-	if not source_path.exists():
-		if not silent:
-			print("Decompiled sources not found, performing decompilation now...  This may take a while, please be patient!\n")
+	with version_lock(mc_version):
+		# A minimal tree made before the toolkit needed more files has to be redone
+		if source_path.exists() and not is_minimal_tree_current(mc_version):
+			shutil.rmtree(source_path.parent.parent)
+
+		# A snapshot is only made once the tree is no longer needed, so use it when there's no tree
+		if not source_path.exists() and has_snapshot(mc_version):
+			return SourceSnapshot(mc_version)
 
-		do_decompile(str(mc_version), "client", clean=True)
+		# Checked while holding the lock, as another run may be partway through decompiling this version
+		if not source_path.exists():
+			if not silent:
+				print("Decompiled sources not found, performing decompilation now...  This may take a while, please be patient!\n")
 
-		if not silent:
-			print("\nDecompilation complete!")
+			decompiled = False
+			if minimal:
+				try:
+					decompile_minimal(mc_version, keep_downloads)
+					decompiled = True
+				except Exception as e:
+					# DecompilerMC's individual steps aren't a stable interface, so fall back to decompiling everything
+					print(f"Warning: minimal decompilation failed ({type(e).__name__}: {e}), decompiling the full client instead")
+					shutil.rmtree(source_path.parent.parent, ignore_errors=True)
+
+			if not decompiled:
+				# Keeping the downloaded jar and mappings lets later decompilations of this version reuse them
+				do_decompile(str(mc_version), "client", clean=not keep_downloads)
+
+				if minimal:
+					prune_sources(mc_version)
+
+			if not silent:
+				print("\nDecompilation complete!")
+		elif minimal and not is_minimal_tree(mc_version):
+			# Shrink full trees left over from earlier runs
+			prune_sources(mc_version)
+
+		if snapshot and source_path.exists():
+			source_snapshot = create_snapshot(source_path, mc_version)
+			shutil.rmtree(source_path.parent.parent)
+			return source_snapshot
 
 	# Just in case the source path still doesn't exist after running decompiler
 	if not source_path.exists():
 		raise Exception("Source path does not exist, there may have been a problem preparing the sources")
 
 	return source_path
+
+# Check whether a version's sources can be used as they are, without decompiling or pruning
+def is_prepared(mc_version, minimal=False, snapshot=False):
+	if not get_source_path(mc_version).exists():
+		return has_snapshot(mc_version)
+	if snapshot or not is_minimal_tree_current(mc_version):
+		return False
+	return not minimal or is_minimal_tree(mc_version)
+
+def get_available_memory():
+	try:
+		return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+	except (AttributeError, ValueError, OSError):
+		return None
+
+def prepare_version(mc_version, keep_downloads=False, minimal=None, snapshot=None):
+	start = time.perf_counter()
+	main(Version(mc_version), silent=True, keep_downloads=keep_downloads, minimal=minimal, snapshot=snapshot)
+	return time.perf_counter() - start
+
+# Prepare the sources for several versions at once, running as many decompilations as the worker and memory limits allow
+def prepare_sources(versions, workers=None, memory_limit=None, keep_downloads=False, minimal=None, snapshot=None, silent=False):
+	minimal = minimal_sources if minimal is None else minimal
+	snapshot = source_snapshots if snapshot is None else snapshot
+
+	results = {}
+	pending = []
+	for v in versions:
+		if is_prepared(v, minimal, snapshot):
+			results[str(v)] = ('ok', 0.0)
+		else:
+			pending.append(str(v))
+
+	if not pending:
+		return results
+
+	memory_limit = memory_limit or get_available_memory()
+	workers = min(workers or os.cpu_count() or 1, len(pending))
+	if memory_limit:
+		workers = max(1, min(workers, memory_limit // decompile_memory))
+
+	if not silent:
+		print(f"Decompiling {len(pending)} version(s) using {workers} worker(s)...  This may take a while, please be patient!")
+
+	with ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = {executor.submit(prepare_version, v, keep_downloads, minimal, snapshot): v for v in pending}
+
+		for done, future in enumerate(as_completed(futures), start=1):
+			mc_version = futures[future]
+			try:
+				results[mc_version] = ('ok', future.result())
+				if not silent:
+					print(f"[{done}/{len(pending)}] Decompiled {mc_version} in {results[mc_version][1]:.1f}s")
+			except Exception as e:
+				results[mc_version] = ('failed', f"{type(e).__name__}: {e}")
+				if not silent:
+					print(f"[{done}/{len(pending)}] Failed to decompile {mc_version}: {e}")
+
+	return results
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/recipe
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# A compact recipe model, which reads from and writes to the recipe dicts stored in caches and items.json
+#
+
+import sys
+
+# Intern a row of names, so equal names share one string; some recipes are parsed with None for an ingredient or cell
+def intern_all(names):
+	try:
+		return tuple(map(sys.intern, names))
+	except TypeError:
+		return tuple(sys.intern(name) if type(name) == str else name for name in names)
+
+class Recipe:
+	__slots__ = ('count', 'ingredients', 'pattern', 'ingredient_count', 'remapped')
+
+	# Ingredients are (item, count) pairs, and a pattern is either a name like 'furnace', None, or a tuple of rows
+	def __init__(self, count, ingredients, pattern):
+		self.count = count
+		self.ingredients = ingredients
+		self.pattern = pattern
+		self.ingredient_count = sum(ic for i, ic in ingredients)
+		self.remapped = None
+
+	@classmethod
+	def from_dict(cls, recipe):
+		pattern = recipe['pattern']
+		if type(pattern) == list:
+			pattern = tuple(map(intern_all, pattern))
+
+		ingredients = recipe['ingredients']
+		return cls(recipe['count'], tuple(zip(intern_all(ingredients), ingredients.values())), pattern)
+
+	def to_dict(self):
+		return {
+			'count': self.count,
+			'ingredients': dict(self.ingredients),
+			'pattern': [list(row) for row in self.pattern] if type(self.pattern) == tuple else self.pattern
+		}
+
+	# The ingredients with their names passed through remap, which is only done once per recipe for each remap
+	def remap_ingredients(self, remap):
+		if self.remapped is None or self.remapped[0] is not remap:
+			self.remapped = (remap, tuple((remap(i), ic) for i, ic in self.ingredients))
+		return self.remapped[1]
+
+	# Like the dicts they replace, recipes are equal whatever order their ingredients are in
+	def key(self):
+		return (self.count, frozenset(self.ingredients), self.pattern)
+
+	def __eq__(self, other):
+		return type(other) == Recipe and self.key() == other.key()
+
+	def __hash__(self):
+		return hash(self.key())
+
+	# Pickled as only what it's made from; remapped ingredients are worked out again when they're needed
+	def __reduce__(self):
+		return (Recipe, (self.count, self.ingredients, self.pattern))
+
+	def __repr__(self):
+		return repr(self.to_dict())
+
+# Convert an item's recipes as stored in JSON (a recipe, a list of them, or None) into models
+def from_json(value):
+	if type(value) == list:
+		return [Recipe.from_dict(r) for r in value]
+	if value:
+		return Recipe.from_dict(value)
+	return value
+
+# Pass as the default of json.dump to write recipe models as the dicts they were read from
+def to_json(value):
+	if isinstance(value, Recipe):
+		return value.to_dict()
+	raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/recipe_store
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Store the recipes for each item in the order they were found, dropping duplicates in constant time
+#
+
+# Convert a recipe into a hashable value that is equal for equal recipes
+# Dicts become frozensets so that, like dict equality, the order of their keys doesn't matter
+def freeze(value):
+	if type(value) == dict:
+		return frozenset((k, freeze(v)) for k, v in value.items())
+	if type(value) == list:
+		return tuple(freeze(v) for v in value)
+	return value
+
+# Items with fewer recipes than this are checked for duplicates by comparing against each recipe, which is quicker than
+# freezing them; once an item gets this many, its frozen recipes are indexed so checks stay constant time
+index_threshold = 4
+
+class RecipeStore:
+	def __init__(self):
+		self.recipes = {}
+		self.index = {}
+
+	# Add a recipe for an item, returning False if the item already has an identical recipe
+	def add(self, item, recipe):
+		recipes = self.recipes.get(item)
+		if recipes is None:
+			self.recipes[item] = [recipe]
+			return True
+
+		index = self.index.get(item)
+		if index is None:
+			if recipe in recipes:
+				return False
+			recipes.append(recipe)
+			if len(recipes) >= index_threshold:
+				self.index[item] = {freeze(r) for r in recipes}
+			return True
+
+		frozen = freeze(recipe)
+		if frozen in index:
+			return False
+
+		index.add(frozen)
+		recipes.append(recipe)
+		return True
+
+	def __contains__(self, item):
+		return item in self.recipes
+
+	def __len__(self):
+		return len(self.recipes)
+
+	def __iter__(self):
+		return iter(self.recipes)
+
+	# All of an item's recipes, in the order they were added
+	def get_all(self, item):
+		return self.recipes.get(item, [])
+
+	# An item's recipes in the shape used in items.json: the recipe itself if there's only one, otherwise a list
+	def get(self, item, default=None):
+		if item not in self.recipes:
+			return default
+
+		recipes = self.recipes[item]
+		return recipes[0] if len(recipes) == 1 else list(recipes)
+
+	def items(self):
+		for item in self.recipes:
+			yield item, self.get(item)
+
+	def to_dict(self):
+		return dict(self.items())
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/source_cache
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Fingerprint the Minecraft sources and toolkit code that cached data was generated from, and cache
+# the results of parsing individual source files
+#
+
+import os, json, hashlib
+from functools import lru_cache
+from pathlib import Path
+
+from .cache_format import cache_format, load_cache, dump_cache, load_errors
+from .instrument import count, stage
+from .source_files import get_source_files
+from .source_snapshot import SourceSnapshot
+
+lib_dir = Path(os.path.dirname(__file__))
+cache_dir = lib_dir / "../output/itemcache"
+
+# Modules whose code affects the data parsed from the Minecraft sources
+parser_modules = [
+	"cache_format.py",
+	"creative_only_items.py",
+	"get_dye_colors.py",
+	"get_items.py",
+	"get_recipes.py",
+	"item_substitutions.py",
+	"item_tags.py",
+	"recipe.py",
+	"recipe_store.py",
+	"source_files.py",
+	"source_reader.py",
+	"source_snapshot.py",
+	"version.py",
+]
+
+def hash_file(path):
+	path = Path(path)
+	if not path.exists():
+		return None
+
+	# Files are only rehashed when their size or modification time changes
+	stat = path.stat()
+	return hash_file_contents(str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+@lru_cache(maxsize=None)
+def hash_file_contents(path, size, mtime):
+	digest = hashlib.sha256()
+	with open(path, 'rb') as f:
+		for chunk in iter(lambda: f.read(1 << 20), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+def fingerprint_toolkit():
+	digest = hashlib.sha256()
+	for module in parser_modules:
+		digest.update(module.encode())
+		digest.update(hash_file(lib_dir / module).encode())
+	return digest.hexdigest()
+
+# Hash a source file, relative to net/minecraft, from either a decompiled tree or a snapshot
+def hash_source(source_path, relpath):
+	if isinstance(source_path, SourceSnapshot):
+		return source_path.digest(relpath)
+	return hash_file(Path(f"{source_path}/{relpath}"))
+
+def fingerprint_sources(source_path, mc_version):
+	return {f: hash_source(source_path, f) for f in get_source_files(mc_version)}
+
+# Build the manifest describing everything a cache entry depends on
+def get_manifest(source_path, mc_version):
+	return {
+		'version': str(mc_version),
+		'format': cache_format['name'],
+		'toolkit': fingerprint_toolkit(),
+		'sources': fingerprint_sources(source_path, mc_version)
+	}
+
+def get_manifest_path(cache_path):
+	return Path(cache_path).with_suffix('.manifest.json')
+
+# Check if a cache entry was generated from exactly the same sources and toolkit code
+def is_cache_valid(cache_path, manifest):
+	manifest_path = get_manifest_path(cache_path)
+	if not Path(cache_path).exists() or not manifest_path.exists():
+		return False
+
+	with open(manifest_path, 'r') as f:
+		try:
+			return json.load(f) == manifest
+		except json.JSONDecodeError:
+			return False
+
+def save_manifest(cache_path, manifest):
+	with open(get_manifest_path(cache_path), 'w') as f:
+		json.dump(manifest, f, indent=2)
+
+# Parse a set of source files, reusing the previous result if none of them (nor the parsers) have changed
+def cached_parse(name, source_path, mc_version, files, parse, no_cache=False):
+	cache_path = cache_dir / str(mc_version) / (name + cache_format['extension'])
+
+	fingerprint = {
+		'toolkit': fingerprint_toolkit(),
+		'sources': {f: hash_source(source_path, f) for f in files}
+	}
+
+	if cache_path.exists() and not no_cache:
+		try:
+			cached = load_cache(cache_path)
+		except load_errors:
+			cached = {}
+		if cached.get('fingerprint') == fingerprint:
+			count('parse cache hits')
+			return cached['data']
+
+	count('parse cache misses')
+	with stage(name):
+		data = parse()
+
+	os.makedirs(cache_path.parent, exist_ok=True)
+	dump_cache({'fingerprint': fingerprint, 'data': data}, cache_path)
+
+	return data
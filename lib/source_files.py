@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/source_files
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# List of the Minecraft source files the toolkit reads, relative to net/minecraft
+#
+
+from .version import Version
+
+def get_source_files(mc_version):
+	files = [
+		"world/item/Items.java",
+		"world/item/DyeColor.java",
+		"data/recipes/RecipeProvider.java",
+		"tags/ItemTags.java",
+	]
+
+	if mc_version >= Version("1.17"):
+		files += [
+			"world/item/HoneycombItem.java",
+			"data/BlockFamilies.java",
+		]
+
+	if mc_version >= Version("1.19.3"):
+		files += [
+			"world/item/CreativeModeTabs.java",
+			"data/recipes/packs/VanillaRecipeProvider.java",
+		]
+	else:
+		files += [
+			"world/item/CreativeModeTab.java",
+		]
+
+	return files
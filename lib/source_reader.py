@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/source_reader
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Read Minecraft source files line by line, without loading whole files into memory
+#
+
+import mmap
+from contextlib import contextmanager
+from pathlib import Path
+
+from .instrument import count
+from .source_snapshot import SourceSnapshot, open_source
+
+# Iterate over the lines of a source file, relative to net/minecraft, as they are read
+# The file is closed as soon as the caller stops iterating, so parsers can stop early once they have what they need
+def read_lines(source_path, relpath):
+	lines = 0
+	try:
+		with open_source(source_path, relpath) as f:
+			for line in f:
+				lines += 1
+				yield line
+	finally:
+		count('lines scanned', lines)
+
+# Map a whole source file into memory as a read-only bytes-like buffer, for scanning with compiled bytes patterns
+@contextmanager
+def map_source(source_path, relpath):
+	if isinstance(source_path, SourceSnapshot):
+		buffer = source_path.read_bytes(relpath)
+		count('bytes scanned', len(buffer))
+		yield buffer
+		return
+
+	with open(Path(f"{source_path}/{relpath}"), 'rb') as f:
+		try:
+			buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			# Empty files can't be mapped
+			yield b''
+			return
+
+		count('bytes scanned', len(buffer))
+		try:
+			yield buffer
+		finally:
+			buffer.close()
+
+# Find every match of a pattern in a buffer, keeping only the first match on each line like a per-line re.search would
+def finditer_first_per_line(pattern, buffer):
+	line_start = -1
+	for match in pattern.finditer(buffer):
+		start = buffer.rfind(b'\n', 0, match.start()) + 1
+		if start != line_start:
+			line_start = start
+			yield match
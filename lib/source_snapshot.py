@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/source_snapshot
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Store the source files the toolkit reads as compressed, content-addressed snapshots, so the full
+# decompiled trees don't need to be kept around
+#
+
+import os, io, json, zlib, hashlib
+from pathlib import Path
+
+from .source_files import get_source_files
+
+lib_dir = Path(os.path.dirname(__file__))
+snapshot_dir = lib_dir / "../output/snapshots"
+
+# Objects are named after the SHA-256 of their uncompressed contents, so files that are identical
+# between versions are only stored once
+object_dir = snapshot_dir / "objects"
+
+def get_object_path(digest):
+	return object_dir / digest[:2] / digest
+
+def get_snapshot_path(mc_version):
+	return snapshot_dir / f"{mc_version}.json"
+
+def write_atomic(path, data):
+	os.makedirs(path.parent, exist_ok=True)
+	temp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+	with open(temp_path, 'wb') as f:
+		f.write(data)
+	os.replace(temp_path, path)
+
+def store_object(data):
+	digest = hashlib.sha256(data).hexdigest()
+	path = get_object_path(digest)
+	if not path.exists():
+		write_atomic(path, zlib.compress(data, 9))
+	return digest
+
+# Extract the source files the toolkit reads from a decompiled tree into a snapshot
+def create_snapshot(source_path, mc_version):
+	files = {}
+	for f in get_source_files(mc_version):
+		path = Path(f"{source_path}/{f}")
+		if path.exists():
+			with open(path, 'rb') as sf:
+				files[f] = store_object(sf.read())
+
+	snapshot = {
+		'version': str(mc_version),
+		'manifest': get_source_files(mc_version),
+		'files': files
+	}
+	write_atomic(get_snapshot_path(mc_version), json.dumps(snapshot, indent=2).encode())
+
+	return SourceSnapshot(mc_version)
+
+# Check whether a snapshot exists and was made with the current list of source files
+def has_snapshot(mc_version):
+	path = get_snapshot_path(mc_version)
+	if not path.exists():
+		return False
+
+	with open(path, 'r') as f:
+		try:
+			return json.load(f).get('manifest') == get_source_files(mc_version)
+		except json.JSONDecodeError:
+			return False
+
+class SourceSnapshot:
+	def __init__(self, mc_version):
+		self.mc_version = mc_version
+
+		with open(get_snapshot_path(mc_version), 'r') as f:
+			self.files = json.load(f)['files']
+
+	def __str__(self):
+		return str(get_snapshot_path(self.mc_version))
+
+	def __repr__(self):
+		return f"SourceSnapshot({self.mc_version})"
+
+	def exists(self, relpath):
+		return relpath in self.files
+
+	# The SHA-256 of the file's contents, matching source_cache.hash_file for the same file in a tree
+	def digest(self, relpath):
+		return self.files.get(relpath)
+
+	def read_bytes(self, relpath):
+		if relpath not in self.files:
+			raise FileNotFoundError(f"{relpath} is not in the {self.mc_version} source snapshot")
+
+		with open(get_object_path(self.files[relpath]), 'rb') as f:
+			return zlib.decompress(f.read())
+
+	def open(self, relpath):
+		return io.TextIOWrapper(io.BytesIO(self.read_bytes(relpath)), encoding='utf-8')
+
+# Open a source file, relative to net/minecraft, from either a decompiled tree or a snapshot
+def open_source(source_path, relpath):
+	if isinstance(source_path, SourceSnapshot):
+		return source_path.open(relpath)
+	return open(Path(f"{source_path}/{relpath}"), 'r', encoding='utf-8')
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - lib/version_manifest
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Look up Minecraft versions from Mojang's version manifest, cached on disk
+#
+
+import os, json, time
+import urllib.request
+from pathlib import Path
+
+from .version import Version
+
+manifest_url = "https://piston-meta.mojang.com/mc/game/version_manifest_v2.json"
+manifest_path = Path(os.path.dirname(__file__)) / "../output/version_manifest.json"
+latest_path = Path(os.path.dirname(__file__)) / "../latest.txt"
+
+# How long a cached manifest is used before checking for a new one, in seconds
+manifest_ttl = 24 * 60 * 60
+
+# Set MC_TOOLKIT_OFFLINE=1 to never access the network, such as on air-gapped machines
+offline = os.environ.get('MC_TOOLKIT_OFFLINE', '') not in ['', '0']
+
+def fetch_version_manifest():
+	with urllib.request.urlopen(manifest_url, timeout=10) as response:
+		manifest = json.load(response)
+
+	os.makedirs(manifest_path.parent, exist_ok=True)
+	temp_path = manifest_path.with_suffix('.tmp')
+	with open(temp_path, 'w') as f:
+		json.dump(manifest, f)
+	os.replace(temp_path, manifest_path)
+
+	return manifest
+
+# Get the version manifest, from the cache if it is recent enough; returns None if it cannot be obtained
+def get_version_manifest(max_age=manifest_ttl):
+	cached = None
+	if manifest_path.exists():
+		with open(manifest_path, 'r') as f:
+			try:
+				cached = json.load(f)
+			except json.JSONDecodeError:
+				cached = None
+
+		if cached and (offline or time.time() - manifest_path.stat().st_mtime < max_age):
+			return cached
+
+	if offline:
+		return cached
+
+	try:
+		return fetch_version_manifest()
+	except (OSError, ValueError) as e:
+		if cached:
+			print(f"Warning: could not download the version manifest ({e}), using the cached copy")
+		return cached
+
+# Get the latest release, falling back to latest.txt if the version manifest is unavailable
+def get_latest_version():
+	manifest = get_version_manifest()
+	if manifest:
+		return Version(manifest['latest']['release'])
+
+	with open(latest_path, 'r') as f:
+		return Version(f.read().strip())
+
+# Get all release versions, oldest first
+def get_release_versions():
+	manifest = get_version_manifest()
+	if not manifest:
+		raise Exception("The version manifest could not be downloaded and is not cached, so version ranges cannot be used")
+
+	return [Version(v['id']) for v in reversed(manifest['versions']) if v['type'] == 'release']
+
+# Expand a list of versions and inclusive version ranges (such as "1.19.3..26.2") into versions
+def expand_versions(specs):
+	versions = []
+	releases = None
+
+	for spec in specs:
+		if '..' in spec:
+			start, end = spec.split('..', 1)
+			if releases is None:
+				releases = get_release_versions()
+			versions += [v for v in releases if (not start or v >= Version(start)) and (not end or v <= Version(end))]
+		else:
+			versions.append(Version(spec))
+
+	# Remove duplicates, keeping the first occurrence
+	unique = []
+	for v in versions:
+		if v not in unique:
+			unique.append(v)
+	return unique
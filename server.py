@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - server.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Serve prices, worth.yml, items.json and shops over local HTTP, keeping each version's data in memory between requests
+#
+
+import argparse, json, threading, time, traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from lib import Version
+from lib.item_tags import get_remap_table
+from lib.pipeline import get_context, release_context
+from lib.recipe import to_json
+from lib.version_manifest import get_latest_version
+from generate_worth import calculate_worth, format_worth_yml, load_base_worth, remap_names_for_essentials
+from generate_shops import build_shops, dump_shop
+
+# The loaded state of each version, keyed by version
+versions = {}
+
+# Only one request at a time loads or prices a version; requests for data that's already loaded don't wait
+lock = threading.Lock()
+
+# Only held while reading or replacing entries of versions, never during a load
+versions_lock = threading.Lock()
+
+# The endpoints of a version, as the number of path parts after the version and the first part
+version_endpoints = [(1, 'worth'), (1, 'worth.yml'), (1, 'items.json'), (2, 'price'), (2, 'shops')]
+
+# Get a version from its name in a URL; returns None if it isn't a version
+def resolve_version(name):
+	if name == 'latest':
+		return get_latest_version()
+	try:
+		return Version(name)
+	except ValueError:
+		return None
+
+def is_version_endpoint(endpoint):
+	return (len(endpoint), endpoint[0]) in version_endpoints
+
+# Load a version's items and price them, replacing anything already loaded for it
+def load_version(mc_version, no_cache=False):
+	start = time.perf_counter()
+
+	# Items are only parsed again when asked to, as they don't depend on base_worth.yml
+	if no_cache:
+		release_context(mc_version)
+	context = get_context(mc_version)
+
+	source_path = context.get_source_path()
+	data = context.get_items(no_cache)
+	remap = get_remap_table(source_path, mc_version, data['items'], no_cache)
+
+	worth = load_base_worth()
+	report = calculate_worth(worth, data['items'], remap)
+
+	state = {
+		'version': mc_version,
+		'source_path': source_path,
+		'data': data,
+		'remap': remap,
+		'worth': worth,
+		'essentials_worth': remap_names_for_essentials(worth),
+		'cycles': report['cycles'],
+		'all_items': None,
+		'shops': None,
+		# Held while loading what's only loaded the first time it's asked for, without holding up other versions
+		'lock': threading.Lock(),
+		'time': time.perf_counter() - start
+	}
+	with versions_lock:
+		versions[str(mc_version)] = state
+	return state
+
+def get_loaded_versions():
+	with versions_lock:
+		return dict(versions)
+
+def get_version_state(mc_version):
+	state = get_loaded_versions().get(str(mc_version))
+	if state is None:
+		with lock:
+			state = get_loaded_versions().get(str(mc_version)) or load_version(mc_version)
+	return state
+
+# items.json lists creative-only items and every recipe, so it's loaded separately, the first time it's asked for
+def get_all_items(state):
+	if state['all_items'] is None:
+		with state['lock']:
+			if state['all_items'] is None:
+				state['all_items'] = get_context(state['version']).get_items(include_creative=True, all_recipes=True)
+	return state['all_items']
+
+def get_shops(state):
+	if state['shops'] is None:
+		with state['lock']:
+			if state['shops'] is None:
+				state['shops'] = build_shops(state['data'], state['essentials_worth'])
+	return state['shops']
+
+# Look up an item's price by its vanilla or EssentialsX name
+def get_price(state, item):
+	if item.upper() in state['worth']:
+		return state['worth'][item.upper()]
+	return state['essentials_worth'].get(item.lower())
+
+class RequestHandler(BaseHTTPRequestHandler):
+	server_version = "mc-toolkit"
+
+	def send(self, status, body, content_type):
+		body = body.encode()
+		self.send_response(status)
+		self.send_header('Content-Type', content_type)
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def send_json(self, data, status=HTTPStatus.OK):
+		self.send(status, json.dumps(data, ensure_ascii=False, default=to_json), 'application/json; charset=utf-8')
+
+	def send_error_json(self, status, message):
+		self.send_json({'error': message}, status)
+
+	def handle_request(self, method):
+		url = urlsplit(self.path)
+		query = parse_qs(url.query, keep_blank_values=True)
+		parts = [unquote(p) for p in url.path.strip('/').split('/') if p]
+
+		if method == 'GET' and parts == ['versions']:
+			return self.send_json({name: {'items': len(state['data']['items']), 'priced': len(state['worth']), 'load_time': round(state['time'], 3)} for name, state in get_loaded_versions().items()})
+
+		if len(parts) < 2:
+			return self.send_error_json(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+
+		mc_version = resolve_version(parts[0])
+		if mc_version is None:
+			return self.send_error_json(HTTPStatus.BAD_REQUEST, f"{parts[0]} is not a Minecraft version, such as 1.20.4 or latest")
+		endpoint = parts[1:]
+
+		if method == 'POST' and endpoint == ['regenerate']:
+			# Reloads base_worth.yml, and the sources too with no_cache
+			with lock:
+				state = load_version(mc_version, no_cache='no_cache' in query)
+			return self.send_json({'version': str(mc_version), 'items': len(state['data']['items']), 'priced': len(state['worth']), 'cycles': state['cycles'], 'time': round(state['time'], 3)})
+
+		# Checked before loading the version, which can mean decompiling it
+		if not is_version_endpoint(endpoint):
+			return self.send_error_json(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+
+		if method != 'GET':
+			return self.send_error_json(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not supported for this endpoint")
+
+		state = get_version_state(mc_version)
+
+		if len(endpoint) == 2 and endpoint[0] == 'price':
+			price = get_price(state, endpoint[1])
+			if price is None:
+				return self.send_error_json(HTTPStatus.NOT_FOUND, f"{endpoint[1]} has no price in {mc_version}")
+			return self.send_json({'item': endpoint[1], 'worth': price})
+
+		if endpoint == ['worth']:
+			return self.send_json(state['essentials_worth'] if 'essentials' in query else state['worth'])
+
+		if endpoint == ['worth.yml']:
+			return self.send(HTTPStatus.OK, format_worth_yml(state['worth'], mc_version, essentials='vanilla' not in query), 'application/yaml; charset=utf-8')
+
+		if endpoint == ['items.json']:
+			return self.send_json(get_all_items(state))
+
+		if len(endpoint) == 2 and endpoint[0] == 'shops':
+			shops = get_shops(state)
+			if endpoint[1] not in shops:
+				return self.send_error_json(HTTPStatus.NOT_FOUND, f"No shop named {endpoint[1]}; the shops are {', '.join(shops)}")
+			return self.send(HTTPStatus.OK, dump_shop(shops[endpoint[1]]), 'application/yaml; charset=utf-8')
+
+		return self.send_error_json(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+
+	def run(self, method):
+		try:
+			self.handle_request(method)
+		except Exception as e:
+			traceback.print_exc()
+			self.send_error_json(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+
+	def do_GET(self):
+		self.run('GET')
+
+	def do_POST(self):
+		self.run('POST')
+
+def serve(host, port, preload=()):
+	for mc_version in preload:
+		print(f"Loading {mc_version}...")
+		load_version(resolve_version(mc_version))
+
+	server = ThreadingHTTPServer((host, port), RequestHandler)
+	print(f"Serving on http://{host}:{port}/")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(prog="server", description="Serve prices, worth.yml, items.json and shops over local HTTP, keeping each version loaded between requests")
+	parser.add_argument('versions', nargs='*', help="Versions to load before serving requests (others are loaded when first asked for)")
+	parser.add_argument('--host', default="127.0.0.1", help="The address to listen on (default: 127.0.0.1, only reachable from this machine)")
+	parser.add_argument('-p', '--port', type=int, default=8637, help="The port to listen on (default: 8637)")
+	args = parser.parse_args()
+
+	serve(args.host, args.port, args.versions)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - tests/test_output.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Check that generated files are only rewritten when they change, and that their deltas and indexes are right
+#
+
+import json, os, sys, tempfile, unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from lib.output import get_delta_path, get_digest_path, read_index, write_output
+
+def format_entries(entries):
+	return "".join(f"{key}: {value}\n" for key, value in entries.items())
+
+class WriteOutputTest(unittest.TestCase):
+	def setUp(self):
+		self.workdir = tempfile.TemporaryDirectory()
+		self.path = Path(self.workdir.name) / "worth.yml"
+		self.entries = {'stone': 1.0, 'cobblestone': 0.5, 'stick': 0.25}
+
+	def tearDown(self):
+		self.workdir.cleanup()
+
+	def write(self, entries, **options):
+		return write_output(self.path, format_entries(entries), entries, **options)
+
+	def read_delta(self):
+		with open(get_delta_path(self.path), 'r') as f:
+			return json.load(f)
+
+	def test_unchanged_contents_are_not_rewritten(self):
+		digest, changed = self.write(self.entries)
+		self.assertTrue(changed)
+		mtime = os.stat(self.path).st_mtime_ns
+
+		self.assertEqual(self.write(dict(self.entries)), (digest, False))
+		self.assertEqual(os.stat(self.path).st_mtime_ns, mtime)
+
+	def test_delta_lists_only_the_changed_entry(self):
+		self.write(self.entries, delta=True)
+		self.write(dict(self.entries, cobblestone=0.75), delta=True)
+
+		delta = self.read_delta()
+		self.assertEqual(delta['changed'], ['cobblestone'])
+		self.assertEqual(delta['added'], [])
+		self.assertEqual(delta['removed'], [])
+
+	def test_delta_after_a_run_without_delta(self):
+		self.write(self.entries)
+		self.write(dict(self.entries, stick=0.3), delta=True)
+		self.assertEqual(self.read_delta()['changed'], ['stick'])
+
+	def test_delta_is_unknown_without_recorded_entries(self):
+		self.write(self.entries)
+		with open(get_digest_path(self.path), 'r') as f:
+			record = json.load(f)
+		del record['entries']
+		with open(get_digest_path(self.path), 'w') as f:
+			json.dump(record, f)
+
+		self.write(dict(self.entries, stick=0.3), delta=True)
+		delta = self.read_delta()
+		self.assertTrue(delta['unknown'])
+		self.assertIsNone(delta['changed'])
+
+	def test_index_is_ignored_after_a_hand_edit(self):
+		self.write(self.entries, index=True)
+		self.assertEqual(read_index(self.path), self.entries)
+
+		with open(self.path, 'a') as f:
+			f.write("dirt: 2.0\n")
+		self.assertIsNone(read_index(self.path))
+
+		# Generating it again rewrites the hand-edited file, and the index is used again
+		self.assertTrue(self.write(self.entries, index=True)[1])
+		self.assertEqual(read_index(self.path), self.entries)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - tests/test_regressions.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Check that the parsers and the worth solver still give what the original line-by-line parsers and multi-pass
+# pricing gave on the benchmark fixtures; tests/expected/ was generated with that original code
+#
+
+import json, os, sys, tempfile, unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import fixtures_dir, fixture_versions
+from lib import source_cache, Version
+from lib.get_recipes import get_recipes
+from lib.get_items import get_items, get_items_legacy
+from lib.pipeline import release_context
+from lib.recipe import to_json
+import generate_worth
+from generate_worth import base_worth, build_worth_graph, calculate_worth, format_worth_yml, load_worth_state, reprice_worth, save_worth_state, solve_worth, write_worth_yml
+
+expected_dir = Path(os.path.dirname(__file__)) / "expected"
+
+# Round-trip through JSON, so recipe models compare equal to the dicts they were stored as
+def as_json(data):
+	return json.loads(json.dumps(data, default=to_json))
+
+class FixtureRegressionTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		# Parse caches are kept out of output/, so tests never touch real cached data
+		cls.cache_dir = tempfile.TemporaryDirectory()
+		cls.original_cache_dir = source_cache.cache_dir
+		source_cache.cache_dir = Path(cls.cache_dir.name)
+		cls.original_worth_state_dir = generate_worth.worth_state_dir
+		generate_worth.worth_state_dir = Path(cls.cache_dir.name) / "worthcache"
+
+	@classmethod
+	def tearDownClass(cls):
+		source_cache.cache_dir = cls.original_cache_dir
+		generate_worth.worth_state_dir = cls.original_worth_state_dir
+		cls.cache_dir.cleanup()
+
+	def check_fixture(self, fixture):
+		with open(expected_dir / f"{fixture}.json", 'r') as f:
+			expected = json.load(f)
+
+		source_path = fixtures_dir / fixture / "net" / "minecraft"
+		mc_version = Version(fixture_versions[fixture])
+		parse_items = get_items_legacy if mc_version < Version("1.19.3") else get_items
+
+		# Recipe handler dispatch
+		with self.subTest('recipes'):
+			self.assertEqual(as_json(get_recipes(source_path, mc_version, no_cache=True)), expected['recipes'])
+		with self.subTest('all recipes'):
+			self.assertEqual(as_json(get_recipes(source_path, mc_version, simplest_only=False, no_cache=True)), expected['recipes_all'])
+
+		# Item declarations and creative tab categories
+		items = parse_items(source_path, mc_version, no_cache=True)
+		with self.subTest('items'):
+			self.assertEqual(as_json(items), expected['items'])
+		with self.subTest('items including creative-only items'):
+			self.assertEqual(as_json(parse_items(source_path, mc_version, include_creative=True, no_cache=True)), expected['items_creative'])
+
+		# The graph solver prices everything in one call, where the original pricing was repeated until nothing changed
+		with self.subTest('worth'):
+			worth = dict(base_worth)
+			calculate_worth(worth, items['items'])
+			self.assertEqual(worth, expected['worth'])
+
+	# Repricing after a base price changes must give what regenerating worth.yml in full gives
+	def check_reprice(self, fixture, item):
+		source_path = fixtures_dir / fixture / "net" / "minecraft"
+		mc_version = Version(fixture_versions[fixture])
+		parse_items = get_items_legacy if mc_version < Version("1.19.3") else get_items
+		items = parse_items(source_path, mc_version, no_cache=True)['items']
+		outpath = Path(self.cache_dir.name) / f"worth-{fixture}.yml"
+		self.addCleanup(release_context, mc_version)
+
+		# What generate_worth saves, without the item tags the fixtures don't have
+		worth = dict(base_worth)
+		graph = build_worth_graph(worth, items)
+		solve_worth(worth, items, graph)
+		digest = write_worth_yml(worth, mc_version, outpath)
+		save_worth_state(mc_version, dict(base_worth), graph, items, worth, True, digest)
+
+		original_price = base_worth[item]
+		base_worth[item] = round(original_price * 2 + 1, 2)
+		self.addCleanup(base_worth.__setitem__, item, original_price)
+
+		updated = reprice_worth(mc_version, outpath)
+		self.assertGreater(len(updated), 1)
+
+		expected = dict(base_worth)
+		calculate_worth(expected, items)
+		self.assertEqual(load_worth_state(mc_version)['worth'], expected)
+		with open(outpath, 'r') as f:
+			self.assertEqual(f.read(), format_worth_yml(expected, mc_version))
+
+	def test_modern(self):
+		self.check_fixture('modern')
+
+	def test_legacy(self):
+		self.check_fixture('legacy')
+
+	def test_reprice_modern(self):
+		self.check_reprice('modern', 'IRON_INGOT')
+
+	def test_reprice_legacy(self):
+		self.check_reprice('legacy', 'IRON_INGOT')
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# 
+# mc-toolkit - tests/test_scenarios.py
+# © 2020-2024 Vinyl Da.i'gyu-Kazotetsu [https://www.queengoob.org].
+# This code is licensed under the GNU GPLv3 license (https://choosealicense.com/licenses/gpl-3.0/).
+#
+# Check that pricing scenarios in one batch, with or without NumPy, gives what pricing each one on its own gives
+#
+
+import sys, tempfile, unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import fixtures_dir, fixture_versions
+from lib import source_cache, Version
+from lib.get_items import get_items, get_items_legacy
+import generate_worth
+from generate_worth import calculate_scenario_worths, calculate_worth, load_scenarios
+
+scenarios_yml = """
+cheap:
+  multiplier: 0.5
+expensive_iron:
+  IRON_INGOT: 40
+mixed:
+  multiplier: 1.37
+  OAK_LOG: 3.33
+  COPPER_INGOT: 0.01
+"""
+
+class ScenarioPricingTest(unittest.TestCase):
+	@classmethod
+	def setUpClass(cls):
+		# Parse caches are kept out of output/, so tests never touch real cached data
+		cls.cache_dir = tempfile.TemporaryDirectory()
+		cls.original_cache_dir = source_cache.cache_dir
+		source_cache.cache_dir = Path(cls.cache_dir.name)
+
+		scenarios_path = Path(cls.cache_dir.name) / "scenarios.yml"
+		with open(scenarios_path, 'w') as f:
+			f.write(scenarios_yml)
+		cls.scenarios = load_scenarios(scenarios_path)
+
+	@classmethod
+	def tearDownClass(cls):
+		source_cache.cache_dir = cls.original_cache_dir
+		cls.cache_dir.cleanup()
+
+	def check_fixture(self, fixture):
+		source_path = fixtures_dir / fixture / "net" / "minecraft"
+		mc_version = Version(fixture_versions[fixture])
+		parse_items = get_items_legacy if mc_version < Version("1.19.3") else get_items
+		items = parse_items(source_path, mc_version, no_cache=True)['items']
+
+		worths = calculate_scenario_worths(items, self.scenarios)
+		self.assertEqual(list(worths), list(self.scenarios))
+		for name, scenario in self.scenarios.items():
+			with self.subTest(name):
+				expected = dict(scenario)
+				calculate_worth(expected, items)
+				self.assertEqual(worths[name], expected)
+
+	def test_python_modern(self):
+		with mock.patch.object(generate_worth, 'np', None):
+			self.check_fixture('modern')
+
+	def test_python_legacy(self):
+		with mock.patch.object(generate_worth, 'np', None):
+			self.check_fixture('legacy')
+
+	@unittest.skipIf(generate_worth.np is None, "NumPy is not installed")
+	def test_numpy_modern(self):
+		self.check_fixture('modern')
+
+	@unittest.skipIf(generate_worth.np is None, "NumPy is not installed")
+	def test_numpy_legacy(self):
+		self.check_fixture('legacy')
+
+if __name__ == '__main__':
+	unittest.main()